@@ -0,0 +1,64 @@
+"""Compares the str and bytes decode paths of json_or_text on large payloads.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_json
+"""
+import asyncio
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict
+
+from yandex_music_api import util
+from yandex_music_api.http import json_or_text
+
+from .payloads import make_playlist
+
+
+class RecordedResponse:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.headers: Dict[str, str] = {'content-type': 'application/json; charset=utf-8'}
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding)
+
+
+async def text_first(response: RecordedResponse):
+    return util.from_json(await response.text(encoding='utf-8'))
+
+
+def measure(decode: Callable[[RecordedResponse], Awaitable], response: RecordedResponse, rounds: int):
+    loop = asyncio.new_event_loop()
+    try:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            loop.run_until_complete(decode(response))
+        elapsed = (time.perf_counter() - started) / rounds
+
+        tracemalloc.start()
+        loop.run_until_complete(decode(response))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        loop.close()
+    return elapsed, peak
+
+
+def main() -> None:
+    for count in (100, 1000, 10000):
+        body = util.to_json({'result': make_playlist(1, 3, count)}).encode()
+        response = RecordedResponse(body)
+        rounds = max(3, 2000 // count)
+
+        print(f'playlist with {count} tracks, {len(body) / 1024 / 1024:.2f} MiB')
+        for name, decode in (('text', text_first), ('bytes', json_or_text)):
+            elapsed, peak = measure(decode, response, rounds)
+            print(f'  {name:>5}: {elapsed * 1000:8.2f} ms  peak {peak / 1024 / 1024:8.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
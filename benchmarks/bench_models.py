@@ -0,0 +1,65 @@
+"""Measures construction time and allocations of models built from search and playlist payloads.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_models
+"""
+import time
+import tracemalloc
+from typing import Callable, List
+
+from yandex_music_api.http import HTTPClient
+from yandex_music_api.playlist import Playlist
+from yandex_music_api.state import ConnectionState
+from yandex_music_api.track import Track
+
+from .payloads import make_playlist, make_tracks
+
+
+def make_state() -> ConnectionState:
+    http = HTTPClient(session=None, loop=None)
+    return ConnectionState(session=None, httpclient=http, loop=None, token=None, client=None)
+
+
+def measure(build: Callable[[], List], rounds: int = 5):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        build()
+    elapsed = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def touch(tracks: List[Track]) -> List[Track]:
+    # what the eager models used to build up front
+    for track in tracks:
+        for album in track.albums:
+            album.artists
+        track.artists
+    return tracks
+
+
+def main() -> None:
+    state = make_state()
+    search_results = make_tracks(list(range(1, 21)))
+    playlist = make_playlist(1, 3, 5000)
+
+    cases = {
+        'search page (20 tracks)': lambda: [Track(state, data) for data in search_results],
+        'playlist (5000 tracks)': lambda: Playlist(state, playlist).tracks
+    }
+    for name, build in cases.items():
+        lazy = measure(build)
+        eager = measure(lambda: touch(build()))
+        print(name)
+        print(f'  lazy : {lazy[0] * 1000:8.2f} ms  {lazy[1] / 1024:10.1f} KiB')
+        print(f'  eager: {eager[0] * 1000:8.2f} ms  {eager[1] / 1024:10.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
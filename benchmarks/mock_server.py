@@ -0,0 +1,187 @@
+"""A local stand-in for the Yandex Music api and its audio storage hosts.
+
+Serves synthetic payloads shaped like the real responses, so the client can be
+benchmarked without a token or network access::
+
+    python -m benchmarks.mock_server --port 8080 --latency 20
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Optional
+
+from aiohttp import web
+
+from yandex_music_api import util
+
+from .payloads import make_library, make_playlist, make_track, make_tracks
+
+DOWNLOAD_INFO_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<download-info><host>{host}</host><path>/audio/{track_id}</path>'
+    '<ts>{ts}</ts><region>-1</region><s>{s}</s></download-info>'
+)
+
+
+class MockServer:
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        audio_size: int = 4 * 1024 * 1024,
+        playlist_size: int = 1000,
+        library_size: int = 5000
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.audio = random.Random(0).randbytes(audio_size)
+        self.playlist_size = playlist_size
+        self.library_size = library_size
+        self.requests = 0
+        self.app = web.Application(middlewares=[self.delay])
+        self.app.add_routes([
+            web.get('/account/status', self.account_status),
+            web.get('/tracks', self.tracks),
+            web.get('/albums', self.albums),
+            web.get('/artists', self.artists),
+            web.get('/playlists/list', self.playlists_list),
+            web.get('/users/{uid}/playlists/{kind}', self.playlist),
+            web.get('/users/{uid}/likes/tracks', self.library),
+            web.get('/users/{uid}/dislikes/tracks', self.library),
+            web.get('/search', self.search),
+            web.get('/tracks/{track_id}/download-info', self.download_info),
+            web.get('/download-info/{track_id}', self.download_info_xml),
+            web.route('*', '/get-mp3/{sign}/{ts}/audio/{track_id}', self.audio_file)
+        ])
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ''
+
+    @web.middleware
+    async def delay(self, request: web.Request, handler):
+        self.requests += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        return await handler(request)
+
+    @staticmethod
+    def result(result: Any) -> web.Response:
+        payload = {
+            'invocationInfo': {'exec-duration-millis': random.randint(1, 30), 'hostname': 'mock', 'req-id': 'mock'},
+            'result': result
+        }
+        return web.Response(body=util.to_json(payload).encode(), content_type='application/json')
+
+    @staticmethod
+    def ids(request: web.Request, name: str) -> list:
+        return [object_id for object_id in request.query.get(name, '').split(',') if object_id]
+
+    async def account_status(self, request: web.Request) -> web.Response:
+        return self.result({'account': {'uid': 1, 'login': 'bench'}})
+
+    async def tracks(self, request: web.Request) -> web.Response:
+        return self.result(make_tracks([int(track_id.partition(':')[0])
+                                        for track_id in self.ids(request, 'track-ids')]))
+
+    async def albums(self, request: web.Request) -> web.Response:
+        return self.result([make_track(int(album_id) * 10)['albums'][0]
+                            for album_id in self.ids(request, 'album-ids')])
+
+    async def artists(self, request: web.Request) -> web.Response:
+        return self.result([make_track(int(artist_id) * 100)['artists'][0]
+                            for artist_id in self.ids(request, 'artist-ids')])
+
+    async def playlists_list(self, request: web.Request) -> web.Response:
+        result = []
+        for playlist_id in self.ids(request, 'playlist-ids'):
+            uid, _, kind = playlist_id.partition(':')
+            playlist = make_playlist(int(uid), int(kind), 0)
+            playlist['trackCount'] = self.playlist_size
+            del playlist['tracks']
+            result.append(playlist)
+        return self.result(result)
+
+    async def playlist(self, request: web.Request) -> web.Response:
+        uid, kind = int(request.match_info['uid']), int(request.match_info['kind'])
+        return self.result(make_playlist(uid, kind, self.playlist_size))
+
+    async def library(self, request: web.Request) -> web.Response:
+        return self.result(make_library(int(request.match_info['uid']), self.library_size))
+
+    async def search(self, request: web.Request) -> web.Response:
+        page = int(request.query.get('page', 0))
+        per_page = 20
+        return self.result({
+            'text': request.query.get('text', ''),
+            'page': page,
+            'perPage': per_page,
+            'tracks': {
+                'type': 'track',
+                'total': 200,
+                'perPage': per_page,
+                'results': make_tracks(list(range(page * per_page + 1, (page + 1) * per_page + 1)))
+            }
+        })
+
+    async def download_info(self, request: web.Request) -> web.Response:
+        track_id = request.match_info['track_id']
+        return self.result([
+            {'codec': 'mp3', 'bitrateInKbps': bitrate, 'gain': False, 'preview': False, 'direct': False,
+             'downloadInfoUrl': f'{self.url}/download-info/{track_id}'}
+            for bitrate in (128, 192, 320)
+        ])
+
+    async def download_info_xml(self, request: web.Request) -> web.Response:
+        xml = DOWNLOAD_INFO_XML.format(
+            host=request.host,
+            track_id=request.match_info['track_id'],
+            ts=format(int(time.time() * 1_000_000), 'x'),
+            s='mock'
+        )
+        return web.Response(text=xml, content_type='text/xml')
+
+    async def audio_file(self, request: web.Request) -> web.StreamResponse:
+        headers = {'Accept-Ranges': 'bytes'}
+        if 'Range' not in request.headers:
+            return web.Response(body=self.audio, content_type='audio/mpeg', headers=headers)
+
+        start, stop, _ = request.http_range.indices(len(self.audio))
+        headers['Content-Range'] = f'bytes {start}-{stop - 1}/{len(self.audio)}'
+        return web.Response(status=206, body=self.audio[start:stop], content_type='audio/mpeg', headers=headers)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://{host}:{port}'
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = MockServer(latency=args.latency / 1000, jitter=args.jitter / 1000, audio_size=args.audio_size)
+    print(f'serving on {await server.start(args.host, args.port)}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='added latency per request, ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra latency, ms')
+    parser.add_argument('--audio-size', type=int, default=4 * 1024 * 1024)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
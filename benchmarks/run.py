@@ -0,0 +1,164 @@
+"""Benchmarks the main Client paths against the local mock server.
+
+Run from the repository root::
+
+    python -m benchmarks.run --concurrency 50 --operations 2000 --latency 20
+    python -m benchmarks.run --scenario get_track --scenario download_link --tracemalloc
+
+Reports throughput, p50/p99 latency, traced allocations and peak RSS per scenario.
+Every scenario runs in a fresh process, so the peak RSS is its own.
+"""
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import resource
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from yandex_music_api import Client
+from yandex_music_api import track as track_module
+from yandex_music_api.http import Route
+
+from .mock_server import MockServer
+
+Operation = Callable[[Client, int], Awaitable[object]]
+
+
+class Result(NamedTuple):
+    scenario: str
+    operations: int
+    elapsed: float
+    latencies: List[float]
+    # None unless tracemalloc was on
+    allocated: Optional[int]
+    peak_rss: int
+
+    def __str__(self) -> str:
+        latencies = sorted(self.latencies)
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        allocated = 'n/a' if self.allocated is None else f'{self.allocated / 1024 / 1024:.2f} MiB'
+        return (f'{self.scenario:<16} {self.operations / self.elapsed:10.1f} op/s'
+                f'  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms'
+                f'  alloc {allocated:>12}  rss {self.peak_rss / 1024:8.1f} MiB')
+
+
+async def get_track(client: Client, i: int):
+    return await client.get_track(i + 1, with_only_result=True)
+
+
+async def get_tracks(client: Client, i: int):
+    return await client.get_track(list(range(i * 100 + 1, i * 100 + 101)))
+
+
+async def get_playlist(client: Client, i: int):
+    playlist = await client.get_playlist_from_userid(1, 1000 + i)
+    return len(playlist.tracks)
+
+
+async def get_likes(client: Client, i: int):
+    return await client.get_likes_tracks()
+
+
+async def search(client: Client, i: int):
+    return await client.search(f'query {i}')
+
+
+async def download_link(client: Client, i: int):
+    track = await client.get_track(i + 1, with_only_result=True)
+    return await track.download_link()
+
+
+async def download(client: Client, i: int):
+    track = await client.get_track(i + 1, with_only_result=True)
+    return await track.download(bytearray())
+
+
+SCENARIOS: Dict[str, Operation] = {
+    'get_track': get_track,
+    'get_tracks': get_tracks,
+    'get_playlist': get_playlist,
+    'get_likes': get_likes,
+    'search': search,
+    'download_link': download_link,
+    'download': download
+}
+
+
+async def run_scenario(client: Client, name: str, operations: int, concurrency: int, trace: bool) -> Result:
+    operation = SCENARIOS[name]
+    counter = itertools.count()
+    latencies: List[float] = []
+
+    # every scenario starts from cold caches
+    for cache in client._state._caches.values():
+        cache.clear()
+
+    async def worker() -> None:
+        while (i := next(counter)) < operations:
+            started = time.perf_counter()
+            await operation(client, i)
+            latencies.append(time.perf_counter() - started)
+
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    allocated = None
+    if trace:
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # the peak of the whole process, which only ran this scenario
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return Result(name, operations, elapsed, latencies, allocated, peak_rss)
+
+
+async def run_client(url: str, name: str, args: argparse.Namespace) -> Result:
+    Route.BASE = url
+    track_module.DOWNLOAD_LINK_FORMAT = 'http://{host}/get-mp3/{sign}/{ts}{path}'
+    async with Client('benchmark', batching=args.batching) as client:
+        await client.identify()
+        return await run_scenario(client, name, args.operations, args.concurrency, args.tracemalloc)
+
+
+def run_isolated(url: str, name: str, args: argparse.Namespace) -> Result:
+    return asyncio.run(run_client(url, name, args))
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = MockServer(latency=args.latency / 1000, jitter=args.jitter / 1000, audio_size=args.audio_size)
+    url = args.server or await server.start()
+    loop = asyncio.get_running_loop()
+    # spawned rather than forked, a fork would start from this process' peak RSS
+    context = multiprocessing.get_context('spawn')
+
+    try:
+        for name in args.scenario or SCENARIOS:
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                print(await loop.run_in_executor(pool, run_isolated, url, name, args))
+    finally:
+        await server.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS))
+    parser.add_argument('--operations', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='added server latency, ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra server latency, ms')
+    parser.add_argument('--audio-size', type=int, default=1024 * 1024)
+    parser.add_argument('--batching', action='store_true', help='enable request coalescing')
+    parser.add_argument('--tracemalloc', action='store_true', help='trace allocations (slows the run down)')
+    parser.add_argument('--server', help='use an already running mock server instead of starting one')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
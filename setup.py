@@ -15,7 +15,7 @@ setup(
     long_description=readme(),
     long_description_content_type='text/markdown',
     url='https://lordcord.fun',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     install_requires=['aiohttp>=3.9.3', 'orjson>=3.9.15', 'xmltodict>=0.13.0'],
     classifiers=[
         'Programming Language :: Python :: 3.11',
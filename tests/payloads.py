@@ -0,0 +1,73 @@
+from typing import Any, Dict, List
+
+
+def make_artist(artist_id: int) -> Dict[str, Any]:
+    return {
+        'id': str(artist_id),
+        'name': f'Artist {artist_id}',
+        'various': False,
+        'composer': False,
+        'genres': ['rock'],
+        'cover': {'type': 'from-album-cover', 'uri': f'avatars.yandex.net/get-music-content/{artist_id}/%%', 'prefix': str(artist_id)}
+    }
+
+
+def make_album(album_id: int, artist_id: int) -> Dict[str, Any]:
+    return {
+        'id': album_id,
+        'title': f'Album {album_id}',
+        'metaType': 'music',
+        'year': 2020,
+        'releaseDate': '2020-01-01T00:00:00+03:00',
+        'coverUri': f'avatars.yandex.net/get-music-content/{album_id}/%%',
+        'ogImage': f'avatars.yandex.net/get-music-content/{album_id}/%%',
+        'genre': 'rock',
+        'trackCount': 10,
+        'available': True,
+        'artists': [make_artist(artist_id)],
+        'labels': [{'id': 1, 'name': 'Label'}],
+        'bests': [album_id * 10, album_id * 10 + 1]
+    }
+
+
+def make_track(track_id: int) -> Dict[str, Any]:
+    album_id = track_id // 10
+    artist_id = track_id // 100
+    return {
+        'id': str(track_id),
+        'realId': str(track_id),
+        'title': f'Track {track_id}',
+        'available': True,
+        'availableForPremiumUsers': True,
+        'coverUri': f'avatars.yandex.net/get-music-content/{album_id}/%%',
+        'ogImage': f'avatars.yandex.net/get-music-content/{album_id}/%%',
+        'durationMs': 180000 + track_id % 60000,
+        'fileSize': 0,
+        'lyricsAvailable': False,
+        'major': {'id': 1, 'name': 'MAJOR'},
+        'normalization': {'gain': -5, 'peak': 32000},
+        'storageDir': '',
+        'type': 'music',
+        'albums': [make_album(album_id, artist_id)],
+        'artists': [make_artist(artist_id)]
+    }
+
+
+def make_tracks(track_ids: List[int]) -> List[Dict[str, Any]]:
+    return [make_track(track_id) for track_id in track_ids]
+
+
+def make_playlist(uid: int, kind: int, count: int) -> Dict[str, Any]:
+    return {
+        'uid': uid,
+        'kind': kind,
+        'title': f'Playlist {kind}',
+        'revision': 1,
+        'trackCount': count,
+        'owner': {'uid': uid, 'login': 'test', 'name': 'test'},
+        'tags': [],
+        'tracks': [
+            {'id': track_id, 'timestamp': '2024-01-01T00:00:00+00:00', 'track': make_track(track_id)}
+            for track_id in range(1, count + 1)
+        ]
+    }
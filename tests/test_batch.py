@@ -0,0 +1,83 @@
+import asyncio
+
+from yandex_music_api.batch import RequestBatcher, track_id_key
+
+
+class FakeFetcher:
+    def __init__(self, missing=(), error=None):
+        self.calls = []
+        self.missing = set(missing)
+        self.error = error
+
+    async def __call__(self, ids, with_positions):
+        self.calls.append((list(ids), with_positions))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return [{'id': int(track_id_key(object_id))} for object_id in ids
+                if object_id not in self.missing]
+
+
+def test_concurrent_loads_are_sent_as_one_request():
+    fetcher = FakeFetcher()
+
+    async def main():
+        batcher = RequestBatcher(fetcher, delay=0.001)
+        return await asyncio.gather(*(batcher.load(object_id) for object_id in (1, 2, 3, 2)))
+
+    results = asyncio.run(main())
+    assert [data['id'] for data in results] == [1, 2, 3, 2]
+    assert fetcher.calls == [(['1', '2', '3'], True)]
+
+
+def test_batches_are_split_at_max_size():
+    fetcher = FakeFetcher()
+
+    async def main():
+        batcher = RequestBatcher(fetcher, delay=0.001, max_size=2)
+        return await asyncio.gather(*(batcher.load(object_id) for object_id in range(5)))
+
+    assert len(asyncio.run(main())) == 5
+    assert [ids for ids, _ in fetcher.calls] == [['0', '1'], ['2', '3'], ['4']]
+
+
+def test_with_positions_is_batched_separately():
+    fetcher = FakeFetcher()
+
+    async def main():
+        batcher = RequestBatcher(fetcher, delay=0.001)
+        await asyncio.gather(batcher.load(1, True), batcher.load(2, False))
+
+    asyncio.run(main())
+    assert sorted(fetcher.calls) == [(['1'], True), (['2'], False)]
+
+
+def test_missing_ids_resolve_to_none():
+    fetcher = FakeFetcher(missing={'2'})
+
+    async def main():
+        batcher = RequestBatcher(fetcher, delay=0.001)
+        return await asyncio.gather(batcher.load(1), batcher.load(2))
+
+    first, second = asyncio.run(main())
+    assert first == {'id': 1} and second is None
+
+
+def test_id_key_matches_payloads_to_requested_ids():
+    fetcher = FakeFetcher()
+
+    async def main():
+        batcher = RequestBatcher(fetcher, id_key=track_id_key, delay=0.001)
+        return await batcher.load('5:50')
+
+    assert asyncio.run(main()) == {'id': 5}
+
+
+def test_errors_reach_every_waiter():
+    fetcher = FakeFetcher(error=RuntimeError('boom'))
+
+    async def main():
+        batcher = RequestBatcher(fetcher, delay=0.001)
+        return await asyncio.gather(batcher.load(1), batcher.load(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
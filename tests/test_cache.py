@@ -0,0 +1,50 @@
+import time
+
+from yandex_music_api.cache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats().evictions == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cache = LRUCache(10, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=5)
+
+    now[0] += 10
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert len(cache) == 1
+
+    now[0] += 60
+    assert 'a' not in cache
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache(10)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert (stats.size, stats.hits, stats.misses) == (1, 1, 1)
+
+
+def test_pop_and_clear():
+    cache = LRUCache(10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.pop('a') == 1
+    assert cache.pop('a', 'default') == 'default'
+    cache.clear()
+    assert len(cache) == 0
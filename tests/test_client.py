@@ -0,0 +1,41 @@
+import asyncio
+import random
+
+from tests.payloads import make_track
+from yandex_music_api.client import Client
+
+
+def test_hydrated_tracks_keep_the_input_order():
+    client = Client("token")
+    calls = []
+
+    async def get_tracks(ids, with_positions=True):
+        calls.append(list(ids))
+        # later chunks answer first, and each chunk comes back shuffled
+        await asyncio.sleep(0.01 / len(calls))
+        payloads = [make_track(int(track_id)) for track_id in ids]
+        random.Random(len(calls)).shuffle(payloads)
+        return payloads
+
+    client._state.http.get_tracks = get_tracks
+    track_ids = [15, 3, 42, 8, 23, 4, 16]
+    tracks = asyncio.run(client.hydrate_tracks(track_ids, chunk_size=2, max_concurrency=4))
+
+    assert [track.id for track in tracks] == track_ids
+    assert len(calls) == 4
+
+
+def test_hydration_skips_cached_tracks():
+    client = Client("token")
+    calls = []
+
+    async def get_tracks(ids, with_positions=True):
+        calls.append(list(ids))
+        return [make_track(int(track_id)) for track_id in ids]
+
+    client._state.http.get_tracks = get_tracks
+    asyncio.run(client.hydrate_tracks([1, 2]))
+    tracks = asyncio.run(client.hydrate_tracks([2, 3, 1]))
+
+    assert [track.id for track in tracks] == [2, 3, 1]
+    assert calls == [['1', '2'], ['3']]
@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import io
+import random
+
+import pytest
+
+from yandex_music_api.download import RangedDownload
+from yandex_music_api.exceptions import DownloadError
+from yandex_music_api.http import HTTPClient
+
+AUDIO = random.Random(0).randbytes(10 * 1024)
+
+
+class FakeHTTP:
+    def __init__(self, audio: bytes = AUDIO, *, ranges: bool = True) -> None:
+        self.audio = audio
+        self.ranges = ranges
+        self.requests = []
+
+    async def get_audio_size(self, url):
+        return len(self.audio) if self.ranges else None
+
+    async def stream_audio(self, url, chunk_size=64 * 1024, headers=None):
+        self.requests.append(headers)
+        start, stop = 0, len(self.audio)
+        if headers is not None:
+            first, _, last = headers["Range"][len("bytes="):].partition("-")
+            start, stop = int(first), int(last) + 1
+            # later segments finish first
+            await asyncio.sleep((len(self.audio) - start) / len(self.audio) / 100)
+        for i in range(start, stop, chunk_size):
+            yield self.audio[i:min(i + chunk_size, stop)]
+
+    def _get_backoff(self, tries):
+        return 0
+
+
+def download(http, target, **options):
+    return asyncio.run(RangedDownload(http, "url", segment_size=1024, **options).into(target))
+
+
+def test_out_of_order_segments_into_empty_bytearray():
+    buffer = bytearray()
+    assert download(FakeHTTP(), buffer) == len(AUDIO)
+    assert buffer == AUDIO
+
+
+def test_out_of_order_segments_into_short_bytearray():
+    buffer = bytearray(100)
+    download(FakeHTTP(), buffer, chunk_size=300)
+    assert buffer == AUDIO
+
+
+def test_out_of_order_segments_into_file():
+    file = io.BytesIO()
+    download(FakeHTTP(), file)
+    assert file.getvalue() == AUDIO
+
+
+def test_too_small_memoryview_is_rejected():
+    with pytest.raises(ValueError):
+        download(FakeHTTP(), memoryview(bytearray(10)))
+
+
+def test_without_ranges_falls_back_to_one_stream():
+    http = FakeHTTP(ranges=False)
+    buffer = bytearray()
+    assert download(http, buffer) == len(AUDIO)
+    assert buffer == AUDIO
+    assert http.requests == [None]
+
+
+def test_failed_segments_are_resumed():
+    class FlakyHTTP(FakeHTTP):
+        failures = 3
+
+        async def stream_audio(self, url, chunk_size=64 * 1024, headers=None):
+            if headers["Range"].startswith("bytes=2048-") and self.failures:
+                self.failures -= 1
+                raise asyncio.TimeoutError
+            async for chunk in super().stream_audio(url, chunk_size, headers):
+                yield chunk
+
+    http = FlakyHTTP()
+    buffer = bytearray()
+    downloader = RangedDownload(http, "url", segment_size=1024, max_retries=1)
+
+    with pytest.raises(DownloadError):
+        asyncio.run(downloader.into(buffer))
+    asyncio.run(downloader.into(buffer))
+    assert buffer == AUDIO
+
+
+class Response:
+    def __init__(self, status, body):
+        self.status = status
+        self.headers = {"Accept-Ranges": "bytes"}
+        self.content_length = len(body)
+        self.content = self
+        self._body = body
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self._body), n):
+            yield self._body[i:i + n]
+
+
+class IgnoresRangeTransport:
+    session = None
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        # answers every request with the whole file
+        yield Response(200, AUDIO)
+
+
+def test_plain_200_for_a_ranged_request_is_not_accepted():
+    http = HTTPClient(transport=IgnoresRangeTransport(), backoff_base=0)
+    buffer = bytearray()
+    downloader = RangedDownload(http, "url", segment_size=1024, max_retries=1)
+
+    with pytest.raises(DownloadError):
+        asyncio.run(downloader.into(buffer))
+    assert not any(segment.received for segment in downloader.segments[1:])
@@ -0,0 +1,70 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from tests.test_http import ScriptedSession
+from yandex_music_api.hooks import Hooks
+from yandex_music_api.http import HTTPClient
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+        self.hooks = Hooks()
+        self.hooks.add("after_response", self.after_response)
+        self.hooks.add("on_retry", self.on_retry)
+
+    def after_response(self, event):
+        self.events.append(("after_response", event.tries, event.status, type(event.error)))
+
+    def on_retry(self, event, delay):
+        self.events.append(("on_retry", event.tries, event.status, type(event.error)))
+
+
+def make_http(*script):
+    recorder = Recorder()
+    return HTTPClient(ScriptedSession(*script), None, backoff_base=0, hooks=recorder.hooks), recorder
+
+
+def test_every_attempt_is_reported():
+    http, recorder = make_http(503, aiohttp.ClientConnectionError(), {"uid": 1})
+    assert asyncio.run(http.get_playlist(1, 3)) == {"uid": 1}
+    assert recorder.events == [
+        ("after_response", 1, 503, type(None)),
+        ("on_retry", 1, 503, type(None)),
+        ("after_response", 2, None, aiohttp.ClientConnectionError),
+        ("on_retry", 2, None, aiohttp.ClientConnectionError),
+        ("after_response", 3, 200, type(None))
+    ]
+
+
+def test_connection_error_that_is_not_retried_is_reported():
+    http, recorder = make_http(aiohttp.ClientConnectionError(), {"kind": 1})
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(http.create_playlist(1, "title", "public"))
+    assert recorder.events == [("after_response", 1, None, aiohttp.ClientConnectionError)]
+
+
+def test_timeout_after_the_last_retry_is_reported():
+    http, recorder = make_http(asyncio.TimeoutError())
+    http.max_retries = 1
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(http.get_playlist(1, 3))
+    assert recorder.events == [
+        ("after_response", 1, None, asyncio.TimeoutError),
+        ("on_retry", 1, None, asyncio.TimeoutError),
+        ("after_response", 2, None, asyncio.TimeoutError)
+    ]
+
+
+def test_failing_hook_does_not_break_the_request():
+    hooks = Hooks()
+    hooks.add("after_response", lambda event: 1 / 0)
+    http = HTTPClient(ScriptedSession({"uid": 1}), None, hooks=hooks)
+    assert asyncio.run(http.get_playlist(1, 3)) == {"uid": 1}
+
+
+def test_unknown_event_is_rejected():
+    with pytest.raises(ValueError):
+        Hooks().add("on_response", print)
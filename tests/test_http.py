@@ -0,0 +1,85 @@
+import asyncio
+import contextlib
+
+import aiohttp
+import pytest
+
+from yandex_music_api import util
+from yandex_music_api.exceptions import YandexMusicServerError
+from yandex_music_api.http import HTTPClient
+
+
+class Response:
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self.headers = {"content-type": "application/json", **(headers or {})}
+        self._body = util.to_json(payload if payload is not None else {}).encode()
+
+    async def read(self):
+        return self._body
+
+    async def text(self, encoding="utf-8"):
+        return self._body.decode(encoding)
+
+
+class ScriptedSession:
+    """Answers requests from a list of statuses, an exception or the final result."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.requests = []
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, Exception):
+            raise step
+        if isinstance(step, int):
+            yield Response(step, headers={"Retry-After": "0"})
+        else:
+            yield Response(200, {"result": step})
+
+
+def make_http(*script):
+    session = ScriptedSession(*script)
+    return HTTPClient(session, None, backoff_base=0), session
+
+
+def test_get_is_retried_on_server_errors():
+    http, session = make_http(502, 503, {"uid": 1})
+    assert asyncio.run(http.get_playlist(1, 3)) == {"uid": 1}
+    assert len(session.requests) == 3
+
+
+def test_get_is_retried_on_connection_errors():
+    http, session = make_http(aiohttp.ClientConnectionError(), {"uid": 1})
+    assert asyncio.run(http.get_playlist(1, 3)) == {"uid": 1}
+    assert len(session.requests) == 2
+
+
+def test_post_is_not_retried_on_server_errors():
+    http, session = make_http(502, 502, {"kind": 1})
+    with pytest.raises(YandexMusicServerError):
+        asyncio.run(http.create_playlist(1, "title", "public"))
+    assert [method for method, _ in session.requests] == ["POST"]
+
+
+def test_post_is_not_retried_on_connection_errors():
+    http, session = make_http(aiohttp.ClientConnectionError(), {"kind": 1})
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(http.create_playlist(1, "title", "public"))
+    assert len(session.requests) == 1
+
+
+def test_post_is_retried_when_rate_limited():
+    http, session = make_http(429, {"kind": 1})
+    assert asyncio.run(http.create_playlist(1, "title", "public")) == {"kind": 1}
+    assert len(session.requests) == 2
+
+
+def test_retries_are_bounded():
+    http, session = make_http(503)
+    with pytest.raises(YandexMusicServerError):
+        asyncio.run(http.get_playlist(1, 3))
+    assert len(session.requests) == http.max_retries + 1
@@ -0,0 +1,77 @@
+import asyncio
+
+from yandex_music_api import util
+from yandex_music_api.client import Client
+from yandex_music_api.library import LibrarySync
+
+
+class FakeLibraryAPI:
+    def __init__(self, client):
+        self.tracks = {}
+        self.revision = 0
+        self.requests = []
+        client._state.http.get_likes_tracks = self.get_likes_tracks
+
+    def set(self, tracks, revision):
+        self.tracks = dict(tracks)
+        self.revision = revision
+
+    async def get_likes_tracks(self, userid, if_modified_since_revision=0):
+        self.requests.append(if_modified_since_revision)
+        library = {'uid': userid, 'revision': self.revision}
+        if if_modified_since_revision < self.revision:
+            library['tracks'] = [{'id': str(track_id), 'albumId': 1, 'timestamp': timestamp}
+                                 for track_id, timestamp in self.tracks.items()]
+        return {'library': library}
+
+
+def make_client():
+    client = Client("token")
+    client._state.userid = 7
+    return client
+
+
+def test_sync_reports_added_and_removed_tracks():
+    client = make_client()
+    api = FakeLibraryAPI(client)
+    sync = LibrarySync(client)
+
+    api.set({1: '2024-01-01T00:00:00+00:00', 2: '2024-01-02T00:00:00+00:00'}, 1)
+    changes = asyncio.run(sync.sync())
+    assert sorted(track.id for track in changes.added) == [1, 2]
+    assert changes.removed == [] and changes.revision == 1
+
+    # 1 was unliked, 3 liked and 2 liked again, which gives it a new timestamp
+    api.set({2: '2024-01-05T00:00:00+00:00', 3: '2024-01-04T00:00:00+00:00'}, 2)
+    changes = asyncio.run(sync.sync())
+    assert sorted(track.id for track in changes.added) == [2, 3]
+    assert changes.removed == [1]
+    assert api.requests == [0, 1]
+
+
+def test_unchanged_revision_reports_nothing():
+    client = make_client()
+    api = FakeLibraryAPI(client)
+    api.set({1: '2024-01-01T00:00:00+00:00'}, 3)
+    sync = LibrarySync(client)
+    asyncio.run(sync.sync())
+
+    changes = asyncio.run(sync.sync())
+    assert changes.added == [] and changes.removed == []
+    assert changes.revision == 3
+    assert sync.tracks == {1: '2024-01-01T00:00:00+00:00'}
+
+
+def test_state_round_trips_through_json():
+    client = make_client()
+    api = FakeLibraryAPI(client)
+    api.set({1: '2024-01-01T00:00:00+00:00', 2: '2024-01-02T00:00:00+00:00'}, 4)
+    sync = LibrarySync(client)
+    asyncio.run(sync.sync())
+
+    restored = LibrarySync.from_dict(client, util.from_json(util.to_json(sync.to_dict())))
+    assert (restored.kind, restored.revision, restored.tracks) == (sync.kind, sync.revision, sync.tracks)
+
+    api.set({2: '2024-01-02T00:00:00+00:00'}, 5)
+    changes = asyncio.run(restored.sync())
+    assert changes.added == [] and changes.removed == [1]
@@ -0,0 +1,102 @@
+import asyncio
+
+from yandex_music_api.batch import LikeQueue
+
+
+class FakeHTTP:
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    async def like_track(self, userid, track_ids):
+        self.calls.append(('like', userid, sorted(track_ids)))
+        if self.error is not None:
+            raise self.error
+
+    async def dislike_track(self, userid, track_ids):
+        self.calls.append(('dislike', userid, sorted(track_ids)))
+        if self.error is not None:
+            raise self.error
+
+
+def test_toggles_are_sent_in_one_batch_per_kind():
+    http = FakeHTTP()
+
+    async def main():
+        queue = LikeQueue(http, 1, delay=0.01)
+        await asyncio.gather(queue.like(1), queue.like(2), queue.dislike(3))
+
+    asyncio.run(main())
+    assert sorted(http.calls) == [('dislike', 1, ['3']), ('like', 1, ['1', '2'])]
+
+
+def test_last_toggle_wins():
+    http = FakeHTTP()
+
+    async def main():
+        queue = LikeQueue(http, 1, delay=0.01)
+        await asyncio.gather(queue.like(1), queue.dislike(1), queue.like(1))
+
+    asyncio.run(main())
+    assert http.calls == [('like', 1, ['1'])]
+
+
+def test_flush_sends_without_waiting_for_the_delay():
+    http = FakeHTTP()
+
+    async def main():
+        queue = LikeQueue(http, 1, delay=60)
+        future = queue.like(1)
+        await queue.flush()
+        await future
+
+    asyncio.run(main())
+    assert http.calls == [('like', 1, ['1'])]
+
+
+def test_close_flushes_pending_toggles():
+    http = FakeHTTP()
+
+    async def main():
+        queue = LikeQueue(http, 1, delay=60)
+        future = queue.dislike(1)
+        await queue.close()
+        return future.done()
+
+    assert asyncio.run(main())
+    assert http.calls == [('dislike', 1, ['1'])]
+
+
+def test_errors_reach_every_waiter():
+    http = FakeHTTP(error=RuntimeError('boom'))
+
+    async def main():
+        queue = LikeQueue(http, 1, delay=0.01)
+        return await asyncio.gather(queue.like(1), queue.like(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+
+def test_batches_are_sent_in_order():
+    events = []
+
+    class SlowHTTP:
+        async def like_track(self, userid, track_ids):
+            events.append(('like', 'start'))
+            # e.g. retried after a 429
+            await asyncio.sleep(0.05)
+            events.append(('like', 'end'))
+
+        async def dislike_track(self, userid, track_ids):
+            events.append(('dislike', 'start'))
+            events.append(('dislike', 'end'))
+
+    async def main():
+        queue = LikeQueue(SlowHTTP(), 1, delay=0)
+        liked = queue.like(1)
+        await asyncio.sleep(0.01)
+        # the like is in flight, the dislike must not overtake it
+        await asyncio.gather(liked, queue.dislike(1))
+
+    asyncio.run(main())
+    assert events == [('like', 'start'), ('like', 'end'), ('dislike', 'start'), ('dislike', 'end')]
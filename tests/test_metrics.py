@@ -0,0 +1,80 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from tests.test_http import ScriptedSession
+from yandex_music_api.http import HTTPClient
+from yandex_music_api.metrics import Histogram, InMemoryExporter, Metrics, PrometheusExporter, to_prometheus
+
+
+def make_http(*script):
+    metrics = Metrics()
+    return HTTPClient(ScriptedSession(*script), None, backoff_base=0, metrics=metrics), metrics
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram((0.1, 1.0))
+    assert histogram.quantile(0.5) == 0.0
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == float('inf')
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+    assert histogram.mean == pytest.approx(0.6625)
+
+
+def test_request_statuses_and_retries_are_counted():
+    http, metrics = make_http(503, {"uid": 1})
+    asyncio.run(http.get_playlist(1, 3))
+    stats, = metrics.routes.values()
+    assert stats.requests == 1
+    assert stats.statuses == {503: 1, 200: 1}
+    assert stats.retries == 1
+    assert stats.errors == 0
+    assert stats.bytes_in > 0
+    assert stats.latency.count == 1
+
+
+def test_connection_errors_are_counted():
+    http, metrics = make_http(aiohttp.ClientConnectionError())
+    http.max_retries = 1
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(http.get_playlist(1, 3))
+    stats, = metrics.routes.values()
+    assert stats.errors == 2
+    assert stats.retries == 1
+    assert stats.statuses == {}
+    assert stats.latency.count == 1
+
+
+def test_prometheus_text():
+    metrics = Metrics(buckets=(0.5,))
+    stats = metrics.route('GET /users/"x"/playlists')
+    stats.requests = 2
+    stats.statuses[200] = 2
+    stats.latency.observe(0.1)
+
+    lines = to_prometheus(metrics).splitlines()
+    assert '# TYPE yandex_music_requests_total counter' in lines
+    assert 'yandex_music_requests_total{route="GET /users/\\"x\\"/playlists"} 2' in lines
+    assert 'yandex_music_responses_total{route="GET /users/\\"x\\"/playlists",status="200"} 2' in lines
+    assert 'yandex_music_request_duration_seconds_bucket{route="GET /users/\\"x\\"/playlists",le="+Inf"} 1' in lines
+
+
+def test_exporters(tmp_path):
+    memory = InMemoryExporter(maxlen=2)
+    prometheus = PrometheusExporter(str(tmp_path / 'metrics.prom'))
+    metrics = Metrics(exporters=[memory, prometheus])
+    assert memory.last is None
+
+    for requests in range(1, 4):
+        metrics.route('GET /tracks').requests = requests
+        metrics.export()
+    assert [snapshot['GET /tracks']['requests'] for snapshot in memory.snapshots] == [2, 3]
+    assert (tmp_path / 'metrics.prom').read_text() == prometheus.text
+    assert not (tmp_path / 'metrics.prom.tmp').exists()
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
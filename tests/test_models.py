@@ -0,0 +1,55 @@
+from tests.payloads import make_track
+from yandex_music_api.http import HTTPClient
+from yandex_music_api.state import ConnectionState
+from yandex_music_api.table import TrackTable
+
+
+def make_state():
+    return ConnectionState(session=None, httpclient=HTTPClient(None, None), loop=None, token=None, client=None)
+
+
+def test_tracks_share_albums_and_artists():
+    state = make_state()
+    first, second = (state.de_list['track'](state, make_track(track_id)) for track_id in (1, 2))
+    assert first.albums[0] is second.albums[0]
+    assert first.artists[0] is second.artists[0]
+
+
+def test_nested_payloads_are_dropped_once_built():
+    state = make_state()
+    data = make_track(1)
+    track = state.de_list['track'](state, data)
+    track.albums, track.artists
+
+    assert track._data['albums'] == [{}] and 'artists' not in track._data
+    assert 'albums' in data
+    assert track.payload['albums'][0]['id'] == data['albums'][0]['id']
+    assert track.payload['artists'][0]['id'] == data['artists'][0]['id']
+    assert list(TrackTable.from_tracks([track]))[0].album_id == int(data['albums'][0]['id'])
+
+
+def test_fetched_albums_refresh_the_shared_object():
+    state = make_state()
+    track = state.de_list['track'](state, make_track(1))
+    album = track.albums[0]
+
+    fetched = {**make_track(1)['albums'][0], 'title': 'Fetched'}
+    assert state.build_model('album', fetched) is album
+    assert album.title == 'Fetched'
+
+
+def test_payload_keeps_per_track_album_fields():
+    state = make_state()
+    payloads = [make_track(track_id) for track_id in (1, 2)]
+    for index, data in enumerate(payloads, 1):
+        data['albums'][0]['trackPosition'] = {'volume': 1, 'index': index}
+    first, second = (state.de_list['track'](state, data) for data in payloads)
+    assert first.albums[0] is second.albums[0]
+
+    fetched = {k: v for k, v in make_track(1)['albums'][0].items() if k != 'trackPosition'}
+    state.build_model('album', {**fetched, 'title': 'Fetched'})
+
+    for index, track in enumerate((first, second), 1):
+        album = track.payload['albums'][0]
+        assert album['trackPosition'] == {'volume': 1, 'index': index}
+        assert album['title'] == 'Fetched'
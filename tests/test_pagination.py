@@ -0,0 +1,66 @@
+import asyncio
+
+from yandex_music_api.pagination import has_next_page, paginate
+
+
+def test_has_next_page():
+    assert has_next_page({'page': 0, 'perPage': 20, 'total': 45}, 1, 20, 20)
+    assert not has_next_page({'page': 0, 'perPage': 20, 'total': 45}, 2, 5, 20)
+    assert not has_next_page({'page': 0, 'perPage': 20, 'total': 40}, 1, 20, 20)
+    # without a pager a short page is the last one
+    assert has_next_page(None, 0, 20, 20)
+    assert not has_next_page(None, 0, 19, 20)
+    assert not has_next_page({'page': 0, 'perPage': 20, 'total': 45}, 0, 0, 20)
+
+
+def collect(pages, page_size=2, with_pager=True):
+    fetched = []
+
+    async def fetch_page(page):
+        fetched.append(page)
+        return pages[page] if page < len(pages) else []
+
+    def get_pager(items):
+        if not with_pager:
+            return None
+        return {'page': 0, 'perPage': page_size, 'total': sum(map(len, pages))}
+
+    async def main():
+        return [item async for item in paginate(fetch_page, list, get_pager, page_size)]
+
+    return asyncio.run(main()), fetched
+
+
+def test_stops_at_the_pager_total():
+    items, fetched = collect([[1, 2], [3, 4], [5]])
+    assert items == [1, 2, 3, 4, 5]
+    assert fetched == [0, 1, 2]
+
+
+def test_stops_at_a_short_page_without_a_pager():
+    items, fetched = collect([[1, 2], [3]], with_pager=False)
+    assert items == [1, 2, 3]
+    assert fetched == [0, 1]
+
+
+def test_stops_at_an_empty_page():
+    items, fetched = collect([[1, 2], []], with_pager=False)
+    assert items == [1, 2]
+    assert fetched == [0, 1]
+
+
+def test_prefetched_page_is_cancelled_when_iteration_stops():
+    async def fetch_page(page):
+        if page:
+            await asyncio.sleep(60)
+        return [page]
+
+    async def main():
+        pages = paginate(fetch_page, list, lambda items: None, page_size=1)
+        async for item in pages:
+            break
+        await pages.aclose()
+        await asyncio.sleep(0)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(main()) == set()
@@ -0,0 +1,139 @@
+import asyncio
+
+from tests.payloads import make_playlist, make_track
+from yandex_music_api.client import Client
+from yandex_music_api.http import HTTPClient
+from yandex_music_api.playlist import Playlist
+from yandex_music_api.state import ConnectionState
+from yandex_music_api.util import Difference
+
+
+def make_state():
+    return ConnectionState(session=None, httpclient=HTTPClient(None, None), loop=None, token=None, client=None)
+
+
+def test_items_without_a_track_are_skipped():
+    data = make_playlist(1, 3, 3)
+    data['tracks'].insert(1, {'timestamp': '2024-01-01T00:00:00+00:00', 'track': None})
+    playlist = Playlist(make_state(), data)
+
+    assert [track.id for track in playlist.tracks] == [1, 2, 3]
+    assert 2 in playlist
+    assert 4 not in playlist
+    assert playlist.index(2) == 2
+    assert playlist.track_at(1) is None
+    assert playlist.track_at(2).id == 2
+
+
+def test_tracks_are_memoized():
+    playlist = Playlist(make_state(), make_playlist(1, 3, 5))
+    assert playlist.tracks is playlist.tracks
+    assert playlist.tracks[0].albums[0] is playlist.tracks[1].albums[0]
+
+
+class FakePlaylistAPI:
+    """Keeps the server side copy of one playlist."""
+
+    def __init__(self, client, count):
+        self.track_ids = list(range(1, count + 1))
+        self.revision = 1
+        self.hydrated = []
+        http = client._state.http
+        for name in ('get_playlists', 'get_playlists_from_user', 'edit_playlist_tracks', 'get_tracks'):
+            setattr(http, name, getattr(self, name))
+
+    def summary(self):
+        # what /playlists/list returns, no tracks
+        data = make_playlist(1, 3, 0)
+        del data['tracks']
+        return {**data, 'revision': self.revision, 'trackCount': len(self.track_ids)}
+
+    async def get_playlists(self, ids, with_positions=True):
+        return [self.summary()]
+
+    async def get_playlists_from_user(self, user_id, kinds, mixed=False, rich_tracks=False):
+        items = [{'id': track_id, 'albumId': track_id // 10, 'timestamp': '2024-01-01T00:00:00+00:00'}
+                 for track_id in self.track_ids]
+        return [{**self.summary(), 'tracks': items}]
+
+    async def edit_playlist_tracks(self, user_id, kind, diff, revision):
+        assert revision == self.revision
+        operation = diff['diff']
+        if operation['op'] == 'delete':
+            del self.track_ids[operation['from']:operation['to']]
+        else:
+            self.track_ids[operation['at']:operation['at']] = [int(track['id']) for track in operation['tracks']]
+        self.revision += 1
+        return self.summary()
+
+    async def get_tracks(self, ids, with_positions=True):
+        self.hydrated.extend(int(track_id) for track_id in ids)
+        return [make_track(int(track_id)) for track_id in ids]
+
+
+def full_playlist(client, api):
+    data = make_playlist(1, 3, len(api.track_ids))
+    return Playlist(client._state, {**data, 'revision': api.revision})
+
+
+def track_less_playlist(client, api):
+    return Playlist(client._state, api.summary())
+
+
+def test_sync_is_a_no_op_for_an_unchanged_revision():
+    client = Client("token")
+    api = FakePlaylistAPI(client, 3)
+    playlist = full_playlist(client, api)
+    tracks = playlist.tracks
+
+    assert not asyncio.run(playlist.sync())
+    assert playlist.tracks is tracks
+    assert api.hydrated == []
+
+
+def test_sync_hydrates_only_new_tracks():
+    client = Client("token")
+    api = FakePlaylistAPI(client, 3)
+    playlist = full_playlist(client, api)
+    first = playlist.tracks[0]
+    api.track_ids = [1, 4, 3]
+    api.revision = 2
+
+    assert asyncio.run(playlist.sync())
+    assert [track.id for track in playlist.tracks] == [1, 4, 3]
+    assert playlist.tracks[0] is first
+    assert api.hydrated == [4]
+    assert playlist.revision == 2
+
+
+def test_sync_fetches_a_track_less_playlist():
+    client = Client("token")
+    api = FakePlaylistAPI(client, 3)
+    playlist = track_less_playlist(client, api)
+
+    assert asyncio.run(playlist.sync())
+    assert [track.id for track in playlist.tracks] == [1, 2, 3]
+    assert not asyncio.run(playlist.sync())
+
+
+def test_edit_is_replayed_on_a_full_playlist():
+    client = Client("token")
+    api = FakePlaylistAPI(client, 3)
+    playlist = full_playlist(client, api)
+
+    asyncio.run(playlist.edit_tracks(Difference.delete(0)))
+    assert [track.id for track in playlist.tracks] == [2, 3]
+    assert playlist.revision == 2 and playlist.track_count == 2
+    assert api.hydrated == []
+    assert not asyncio.run(playlist.sync())
+
+
+def test_edit_leaves_a_track_less_playlist_to_sync():
+    client = Client("token")
+    api = FakePlaylistAPI(client, 3)
+    playlist = track_less_playlist(client, api)
+
+    asyncio.run(playlist.edit_tracks(Difference.delete(0)))
+    assert playlist.revision == 2 and playlist.track_count == 2
+    assert asyncio.run(playlist.sync())
+    assert [track.id for track in playlist.tracks] == [2, 3]
@@ -0,0 +1,49 @@
+import asyncio
+
+from tests.payloads import make_track
+from yandex_music_api.client import Client
+from yandex_music_api.storage import SQLiteCache
+
+
+def test_round_trip_between_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = SQLiteCache(path)
+    writer.put_many('track', {'1': make_track(1), '2': make_track(2)})
+    writer.close()
+
+    reader = SQLiteCache(path)
+    assert reader.get_many('track', ['1', '2', '3']) == {'1': make_track(1), '2': make_track(2)}
+    # keys are per object type
+    assert reader.get('album', '1') is None
+    reader.close()
+
+
+def test_expired_payloads_are_not_returned(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl={'album': 0})
+    cache.put('track', '1', {'id': 1}, ttl=-1)
+    cache.put('track', '2', {'id': 2})
+    cache.put('album', '3', {'id': 3})
+
+    assert cache.get_many('track', ['1', '2']) == {'2': {'id': 2}}
+    assert cache.get('album', '3') is None
+    assert cache.purge_expired() == 2
+    cache.close()
+
+
+def test_client_reads_through_the_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    calls = []
+
+    async def get_tracks(ids, with_positions=True):
+        calls.append(list(ids))
+        return [make_track(int(track_id)) for track_id in ids]
+
+    for _ in range(2):
+        # a fresh client has an empty in-memory cache, as another shard would
+        client = Client("token", persistent_cache=cache)
+        client._state.http.get_tracks = get_tracks
+        tracks = asyncio.run(client.get_track([1, 2]))
+        assert [track.id for track in tracks] == [1, 2]
+
+    assert calls == [['1', '2']]
+    cache.close()
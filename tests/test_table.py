@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from tests.payloads import make_playlist
+from yandex_music_api import table as table_module
+from yandex_music_api.table import TrackTable
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(table_module, 'numpy', None)
+    return request.param
+
+
+def make_table(ids, timestamps):
+    table = TrackTable()
+    for track_id, timestamp in zip(ids, timestamps):
+        table.append(track_id, timestamp=timestamp)
+    return table
+
+
+def ids(table):
+    return [row.id for row in table]
+
+
+def test_from_library():
+    payload = {'library': {'uid': 1, 'revision': 2, 'tracks': [
+        {'id': '10', 'albumId': '5', 'timestamp': '2024-01-01T00:00:00+00:00'},
+        {'id': '11', 'timestamp': None}
+    ]}}
+    first, second = TrackTable.from_library(payload)
+    assert first.id == 10 and first.album_id == 5 and first.timestamp > 0
+    assert second.album_id == -1 and math.isnan(second.timestamp)
+
+
+def test_from_playlist():
+    table = TrackTable.from_playlist(make_playlist(1, 3, 3))
+    assert ids(table) == [1, 2, 3]
+    assert table[0].album_id == 0 and table[0].duration_ms == 180001
+
+
+def test_sort_keeps_ties_in_their_original_order(backend):
+    table = make_table([10, 11, 12, 13], [1.0, 2.0, 2.0, 3.0])
+    assert ids(table.sort()) == [10, 11, 12, 13]
+    assert ids(table.sort(reverse=True)) == [13, 11, 12, 10]
+
+
+def test_filter_take_and_dedupe(backend):
+    table = make_table([3, 1, 3, 2, 1], [0.0] * 5)
+    assert ids(table.filter([True, False, True, True, False])) == [3, 3, 2]
+    assert ids(table.take([4, 0])) == [1, 3]
+    assert ids(table.dedupe()) == [3, 1, 2]
+
+
+def test_column_does_not_block_append(backend):
+    table = make_table([1, 2], [0.0, 0.0])
+    column = table.column('id')
+    table.append(3)
+    assert list(column) == [1, 2]
+    assert ids(table) == [1, 2, 3]
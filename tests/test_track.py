@@ -0,0 +1,46 @@
+import asyncio
+
+from yandex_music_api.http import HTTPClient
+from yandex_music_api.state import ConnectionState
+from yandex_music_api.track import ShortTrack
+
+DOWNLOAD_INFO = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<download-info><host>storage.example</host><path>/audio/123</path>'
+    '<ts>not-hex</ts><region>0</region><s>salt</s></download-info>'
+)
+
+
+class FakeHTTP(HTTPClient):
+    def __init__(self):
+        super().__init__()
+        self.resolves = 0
+
+    async def get_download_info(self, track_id):
+        self.resolves += 1
+        return [{'bitrateInKbps': 192, 'codec': 'mp3', 'downloadInfoUrl': 'https://info'}]
+
+    async def get_from_downloadinfo(self, url):
+        return DOWNLOAD_INFO
+
+
+def make_state():
+    return ConnectionState(session=None, httpclient=FakeHTTP(), loop=None, token=None, client=None)
+
+
+def test_short_track_ids_are_ints():
+    track = ShortTrack(make_state(), {'id': '123', 'albumId': 1, 'timestamp': '2024-01-01T00:00:00+00:00'})
+    assert track.id == 123
+
+
+def test_short_track_download_link_is_cached():
+    state = make_state()
+    track = ShortTrack(state, {'id': '123', 'albumId': 1, 'timestamp': '2024-01-01T00:00:00+00:00'})
+
+    async def resolve_twice():
+        return await track.download_link(), await track.download_link()
+
+    first, second = asyncio.run(resolve_twice())
+    assert first == second
+    assert state.http.resolves == 1
+    assert state.get_download_link((123, 192, 'mp3')) == first
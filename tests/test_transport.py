@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import gzip
+import os
+import random
+
+from yandex_music_api import util
+from yandex_music_api.transport import RecordingTransport, ReplayTransport, Transport
+
+AUDIO = random.Random(0).randbytes(256 * 1024)
+
+
+class Content:
+    def __init__(self, body):
+        self._body = body
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self._body), n):
+            yield self._body[i:i + n]
+
+    async def read(self):
+        return self._body
+
+
+class Response:
+    def __init__(self, status, body, content_type):
+        self.status = status
+        self.headers = {"Content-Type": content_type}
+        self.content_length = len(body)
+        self.content = Content(body)
+
+    async def read(self):
+        return await self.content.read()
+
+
+class FakeSession:
+    """Echoes the posted body back, serves AUDIO for audio urls."""
+
+    def __init__(self):
+        self.requests = 0
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        if url.endswith(".mp3"):
+            yield Response(200, AUDIO, "audio/mpeg")
+        else:
+            payload = {"result": {"method": method, "data": kwargs.get("data")}}
+            yield Response(200, util.to_json(payload).encode(), "application/json")
+
+
+async def exchange(transport):
+    results = []
+    for data in ("title=first", "title=second"):
+        async with transport.request("POST", "https://api/playlists/create", data=data) as response:
+            results.append(await response.read())
+
+    audio = bytearray()
+    async with transport.request("GET", "https://cdn/track.mp3", audio=True) as response:
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            audio += chunk
+    results.append(bytes(audio))
+    return results
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    session = FakeSession()
+    recorder = RecordingTransport(path, session, audio_session=session)
+    recorded = asyncio.run(exchange(recorder))
+    asyncio.run(recorder.close())
+
+    replayed = asyncio.run(exchange(ReplayTransport(path)))
+    assert replayed == recorded
+    assert recorded[2] == AUDIO
+    # posts with different bodies are not mixed up
+    assert recorded[0] != recorded[1]
+
+
+def test_audio_is_stored_by_reference(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    session = FakeSession()
+    recorder = RecordingTransport(path, session, audio_session=session)
+    asyncio.run(exchange(recorder))
+    asyncio.run(recorder.close())
+
+    with gzip.open(path, "rb") as file:
+        records = [util.from_json(line) for line in file]
+    audio, = (record for record in records if "body_ref" in record)
+    assert "body" not in audio
+    assert os.path.getsize(os.path.join(path + ".blobs", audio["body_ref"])) == len(AUDIO)
+    assert os.path.getsize(path) < len(AUDIO) // 10
+
+
+def test_close_only_closes_owned_sessions():
+    async def run():
+        session = FakeSession()
+        transport = Transport(session)
+        audio_session = transport.get_session(audio=True)
+        assert transport.get_session() is session
+        assert transport.get_session(audio=True) is audio_session
+        assert audio_session.connector.limit == transport.audio_connector.limit
+
+        await transport.close()
+        assert audio_session.closed
+        assert not session.closed
+        assert transport.session is session
+        assert transport.audio_session is None
+
+        # a closed transport opens a fresh session when it is used again
+        reopened = transport.get_session(audio=True)
+        assert reopened is not audio_session
+        await transport.close()
+        assert reopened.closed
+
+    asyncio.run(run())
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from yandex_music_api.util import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_different_keys_do_not_share():
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(flight.do('a', lambda: asyncio.sleep(0, 'a')),
+                                    flight.do('b', lambda: asyncio.sleep(0, 'b')))
+
+    assert asyncio.run(main()) == ['a', 'b']
+
+
+def test_finished_calls_are_forgotten():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        flight = SingleFlight()
+        first = await flight.do('key', fetch)
+        assert 'key' not in flight
+        return first, await flight.do('key', fetch)
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_errors_reach_every_caller():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('boom')
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do('key', fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def main():
+        flight = SingleFlight()
+        leader = asyncio.create_task(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == 'value'
+    assert len(calls) == 2
+
+
+def test_cancelled_follower_does_not_cancel_leader():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def main():
+        flight = SingleFlight()
+        leader = asyncio.create_task(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == 'value'
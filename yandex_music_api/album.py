@@ -1,7 +1,8 @@
 from __future__ import annotations
+import sys
 from datetime import datetime
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 from yandex_music_api.types import AlbumPayload
 
@@ -12,24 +13,39 @@ if TYPE_CHECKING:
 
 
 class Album:
+    __slots__ = (
+        '_state', '_data', 'id', 'title', 'type', 'year', 'image', 'track_count',
+        '_artist_data', '_artists', 'best_track_ids', 'release_date', '__weakref__'
+    )
+
     def __init__(self, state: ConnectionState, data: AlbumPayload) -> None:
         self._state = state
+        # kept once per album, tracks drop their own nested copy
+        self._data = data
         self.id: int = int(data['id'])
-        self.title: str = data['title']
-        self.type: str = data['metaType']
+        self.title: str = sys.intern(data['title'])
+        self.type: str = sys.intern(data['metaType'])
         self.year: int = data.get('year')
         self.image: str = data['ogImage']
         self.track_count: int = int(data['trackCount'])
-        self.artists: List[Artist] = [
-            state.de_list['artist'](state, artist) for artist in data['artists']]
+        self._artist_data = data['artists']
+        self._artists: Optional[List[Artist]] = None
         self.best_track_ids = list(map(int, data['bests']))
         if release_date := data.get('releaseDate'):
             self.release_date: datetime = datetime.fromisoformat(release_date)
 
+    @property
+    def artists(self) -> List[Artist]:
+        if self._artists is None:
+            self._artists = [self._state.intern_model('artist', artist)
+                             for artist in self._artist_data]
+        return self._artists
+
     async def get_tracks(self) -> List[Track]:
         json = await self._state.http.get_album_with_tracks(self.id)
-        tracks = json["volumes"]
-        return [self._state.de_list['track'](self._state, track_data) for datas in tracks for track_data in datas]
+        tracks = [track_data for datas in json["volumes"] for track_data in datas]
+        return await self._state.build_models(
+            'track', lambda track_data: self._state.de_list['track'](self._state, track_data), tracks)
 
     def __repr__(self) -> str:
         artists_name = ', '.join([art.name for art in self.artists])
@@ -1,22 +1,36 @@
 from __future__ import annotations
+import sys
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, AsyncIterator, List, Literal, Optional
 
+from yandex_music_api.pagination import paginate
 from yandex_music_api.types import ArtistPayload
 
 if TYPE_CHECKING:
     from yandex_music_api.state import ConnectionState
+    from yandex_music_api.album import Album
     from yandex_music_api.track import Track
 
 
 class Artist:
+    __slots__ = ('_state', '_data', 'id', 'name', 'various', '_popular_data', '_popular_track', '__weakref__')
+
     def __init__(self, state: ConnectionState, data: ArtistPayload) -> None:
         self._state = state
+        # kept once per artist, tracks drop their own nested copy
+        self._data = data
         self.id: int = int(data['id'])
-        self.name: str = data['name']
+        self.name: str = sys.intern(data['name'])
         self.various: bool = data['various']
-        self.popular_track: List[Track] = [state.de_list['track'](
-            state, trc_data) for addtionally in data.get('popularTracks', []) for trc_data in addtionally]
+        self._popular_data = data.get('popularTracks', [])
+        self._popular_track: Optional[List[Track]] = None
+
+    @property
+    def popular_track(self) -> List[Track]:
+        if self._popular_track is None:
+            self._popular_track = [self._state.de_list['track'](self._state, trc_data)
+                                   for addtionally in self._popular_data for trc_data in addtionally]
+        return self._popular_track
 
     async def get_rating_tracks(self, page: int = 0, page_size: int = 20) -> List[Track]:
         responce = await self._state.http.get_artist_tracks(
@@ -29,7 +43,7 @@ class Artist:
 
         return [self._state.store_track(self._state.de_list['track'](self._state, data)) for data in tracks]
 
-    async def get_direct_albums(self, page: int = 0, page_size: int = 20) -> List[Track]:
+    async def get_direct_albums(self, page: int = 0, page_size: int = 20) -> List[Album]:
         responce = await self._state.http.get_artist_direct_albums(
             self.id,
             page,
@@ -37,4 +51,26 @@ class Artist:
         )
         albums = responce['albums']
 
-        return [self._state.store_track(self._state.de_list['album'](self._state, data)) for data in albums]
+        return [self._state.store_album(self._state.build_model('album', data)) for data in albums]
+
+    def iter_rating_tracks(self, page_size: int = 20) -> AsyncIterator[Track]:
+        return paginate(
+            lambda page: self._state.http.get_artist_tracks(self.id, page, page_size),
+            lambda responce: [self._state.store_track(self._state.de_list['track'](self._state, data))
+                              for data in responce['tracks']],
+            lambda responce: responce.get('pager'),
+            page_size
+        )
+
+    def iter_direct_albums(
+        self,
+        page_size: int = 20,
+        sort_by: Literal['year', 'rating'] = 'rating'
+    ) -> AsyncIterator[Album]:
+        return paginate(
+            lambda page: self._state.http.get_artist_direct_albums(self.id, page, page_size, sort_by),
+            lambda responce: [self._state.store_album(self._state.build_model('album', data))
+                              for data in responce['albums']],
+            lambda responce: responce.get('pager'),
+            page_size
+        )
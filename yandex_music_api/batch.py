@@ -0,0 +1,170 @@
+from __future__ import annotations
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
+BatchFetcher = Callable[[List[str], bool], Coroutine[Any, Any, List[dict]]]
+
+
+def payload_id_key(data: dict) -> str:
+    return str(data['id'])
+
+
+def track_id_key(track_id: str) -> str:
+    # "track_id:album_id" is accepted by the api but the payload only has the track id
+    return track_id.partition(':')[0]
+
+
+def playlist_payload_key(data: dict) -> str:
+    return f"{data['uid']}:{data['kind']}"
+
+
+class RequestBatcher:
+    def __init__(
+        self,
+        fetcher: BatchFetcher,
+        payload_key: Callable[[dict], str] = payload_id_key,
+        id_key: Callable[[str], str] = str,
+        *,
+        delay: float = 0.005,
+        max_size: int = 100
+    ) -> None:
+        self.fetcher = fetcher
+        self.payload_key = payload_key
+        self.id_key = id_key
+        self.delay = delay
+        self.max_size = max_size
+        self._pending: Dict[bool, Dict[str, List[asyncio.Future]]] = {}
+        self._handles: Dict[bool, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, object_id: str, with_positions: bool = True) -> 'asyncio.Future[Optional[dict]]':
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(with_positions, {})
+        pending.setdefault(str(object_id), []).append(future)
+
+        if len(pending) >= self.max_size:
+            self._dispatch(with_positions)
+        elif with_positions not in self._handles:
+            self._handles[with_positions] = loop.call_later(
+                self.delay, self._dispatch, with_positions)
+        return future
+
+    def _dispatch(self, with_positions: bool) -> None:
+        handle = self._handles.pop(with_positions, None)
+        if handle is not None:
+            handle.cancel()
+
+        pending = self._pending.pop(with_positions, None)
+        if not pending:
+            return
+
+        task = asyncio.create_task(self._run(pending, with_positions))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[str, List[asyncio.Future]], with_positions: bool) -> None:
+        try:
+            results = await self.fetcher(list(pending), with_positions)
+        except Exception as exc:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        found = {self.payload_key(data): data for data in results}
+        for object_id, futures in pending.items():
+            data = found.get(self.id_key(object_id))
+            for future in futures:
+                if not future.done():
+                    future.set_result(data)
+
+
+class LikeQueue:
+    def __init__(self, http: HTTPClient, userid: int, *, delay: float = 0.5) -> None:
+        self.http = http
+        self.userid = userid
+        self.delay = delay
+        # track id -> (liked, waiters)
+        self._pending: Dict[str, Tuple[bool, List[asyncio.Future]]] = {}
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # batches must reach the server in order, or a late like could undo a later dislike
+        self._flush_lock = asyncio.Lock()
+
+    def like(self, track_id: Union[str, int]) -> 'asyncio.Future[None]':
+        return self._push(str(track_id), True)
+
+    def dislike(self, track_id: Union[str, int]) -> 'asyncio.Future[None]':
+        return self._push(str(track_id), False)
+
+    def _push(self, track_id: str, liked: bool) -> 'asyncio.Future[None]':
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # toggles within the window cancel each other out, only the last one is sent
+        _, waiters = self._pending.get(track_id, (liked, []))
+        waiters.append(future)
+        self._pending[track_id] = (liked, waiters)
+
+        if self._handle is None:
+            self._handle = loop.call_later(self.delay, self._schedule_flush)
+        return future
+
+    def _schedule_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        async with self._flush_lock:
+            # toggles made while the previous batch was in flight go out in this one
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            likes = [track_id for track_id, (liked, _) in pending.items() if liked]
+            dislikes = [track_id for track_id, (liked, _) in pending.items() if not liked]
+            await asyncio.gather(
+                self._send(self.http.like_track, likes, pending),
+                self._send(self.http.dislike_track, dislikes, pending)
+            )
+
+    async def _send(
+        self,
+        method: Callable[[int, List[str]], Coroutine[Any, Any, Any]],
+        track_ids: List[str],
+        pending: Dict[str, Tuple[bool, List[asyncio.Future]]]
+    ) -> None:
+        if not track_ids:
+            return
+
+        try:
+            await method(self.userid, track_ids)
+        except Exception as exc:
+            result = exc
+        else:
+            result = None
+
+        for track_id in track_ids:
+            for future in pending[track_id][1]:
+                if future.done():
+                    continue
+                if result is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(result)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
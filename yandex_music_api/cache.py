@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class CacheOptions(NamedTuple):
+    maxsize: int
+    ttl: Optional[float] = None
+
+
+class CacheStats(NamedTuple):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+DEFAULT_CACHE_OPTIONS: Dict[str, CacheOptions] = {
+    'track': CacheOptions(10000, 3600),
+    'album': CacheOptions(5000, 3600),
+    'artist': CacheOptions(5000, 3600),
+    'playlist': CacheOptions(500, 60),
+    'user': CacheOptions(1000, 3600),
+    'download_link': CacheOptions(2000, 60)
+}
+
+
+class LRUCache(Generic[T]):
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: 'OrderedDict[Hashable, Tuple[T, Optional[float]]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[T, Optional[float]]]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at = item[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[T]:
+        item = self._lookup(key)
+        if item is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return item[0]
+
+    def set(self, key: Hashable, value: T, ttl: Optional[float] = None) -> T:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Optional[T]:
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(len(self._data), self.maxsize, self.hits, self.misses, self.evictions)
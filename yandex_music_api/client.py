@@ -1,30 +1,179 @@
 import asyncio
+import time
+from concurrent.futures import Executor
 import aiohttp
 
 from yandex_music_api.artist import Artist
+from yandex_music_api.batch import (
+    BatchFetcher, RequestBatcher, playlist_payload_key, track_id_key)
 from yandex_music_api.album import Album
+from yandex_music_api.cache import CacheOptions
 from yandex_music_api.playlist import Playlist
 from yandex_music_api.track import ShortTrack, Track
 from yandex_music_api.http import HTTPClient
+from yandex_music_api.hooks import Hooks
+from yandex_music_api.metrics import Metrics
+from yandex_music_api.offload import Offloader
 from yandex_music_api.state import ConnectionState
+from yandex_music_api.storage import SQLiteCache
+from yandex_music_api.table import TrackTable
+from yandex_music_api.transport import (
+    DEFAULT_API_CONNECTOR, DEFAULT_AUDIO_CONNECTOR, ConnectorOptions, Transport)
 from yandex_music_api.exceptions import NotFound
+from yandex_music_api.pagination import paginate
+from yandex_music_api.types import PagerPayload, PlaylistPayload, SearchPayload
+from yandex_music_api.util import parse_ids
 
-from typing import List, Union
+from typing import Any, AsyncIterator, Dict, Hashable, Iterable, List, Literal, Optional, Union
+
+
+def _cache_key(object_type: str, object_id: str) -> Hashable:
+    if object_type == 'playlist':
+        return object_id
+    if object_type == 'track':
+        object_id = track_id_key(object_id)
+    try:
+        return int(object_id)
+    except ValueError:
+        return object_id
 
 
 class Client:
     def __init__(
         self,
-        token: str
+        token: str,
+        *,
+        batching: bool = False,
+        batch_delay: float = 0.005,
+        batch_size: int = 100,
+        cache_options: Optional[Dict[str, CacheOptions]] = None,
+        max_concurrency: int = 64,
+        max_retries: int = 3,
+        executor: Optional[Executor] = None,
+        offload_threshold: int = 1024 * 1024,
+        offload_items: int = 1000,
+        persistent_cache: Optional[SQLiteCache] = None,
+        like_batching: bool = False,
+        like_delay: float = 0.5,
+        transport: Optional[Transport] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[Hooks] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        connector: ConnectorOptions = DEFAULT_API_CONNECTOR,
+        audio_connector: ConnectorOptions = DEFAULT_AUDIO_CONNECTOR
     ) -> None:
-        session = aiohttp.ClientSession()
-        loop = asyncio.get_event_loop()
-        http = HTTPClient(session=session, loop=loop)
+        # sessions are created lazily by the transport, inside the running loop
+        if transport is None:
+            transport = Transport(session, connector=connector, audio_connector=audio_connector)
+        offloader = Offloader(executor, json_threshold=offload_threshold, items_threshold=offload_items)
+        http = HTTPClient(session=session,
+                          max_concurrency=max_concurrency, max_retries=max_retries,
+                          offloader=offloader, transport=transport, metrics=metrics,
+                          hooks=hooks)
         http.token = token
         self._state = ConnectionState(
-            session=session, httpclient=http, loop=loop, token=token, client=self)
+            session=session, httpclient=http, loop=None, token=token, client=self,
+            cache_options=cache_options, persistent_cache=persistent_cache,
+            like_delay=like_delay if like_batching else None)
         self.token = token
 
+        self._batchers: Dict[str, RequestBatcher] = {}
+        if batching:
+            options = {'delay': batch_delay, 'max_size': batch_size}
+            self._batchers = {
+                'track': RequestBatcher(http.get_tracks, id_key=track_id_key, **options),
+                'album': RequestBatcher(http.get_albums, **options),
+                'artist': RequestBatcher(http.get_artists, **options),
+                'playlist': RequestBatcher(http.get_playlists, playlist_payload_key, **options)
+            }
+
+    async def _fetch(
+        self,
+        object_type: str,
+        ids: Union[List[Union[str, int]], int, str],
+        with_positions: bool,
+        fetcher: BatchFetcher
+    ) -> List[dict]:
+        batcher = self._batchers.get(object_type)
+        if batcher is None:
+            return await fetcher(ids, with_positions)
+
+        futures = [batcher.load(object_id, with_positions)
+                   for object_id in parse_ids(ids)]
+        return [data for data in await asyncio.gather(*futures) if data is not None]
+
+    async def _get_objects(
+        self,
+        object_type: str,
+        ids: Union[List[Union[str, int]], int, str],
+        with_positions: bool,
+        fetcher: BatchFetcher
+    ) -> List[Any]:
+        ids = parse_ids(ids)
+        keys = [_cache_key(object_type, object_id) for object_id in ids]
+
+        found = {}
+        missing = []
+        for object_id, key in zip(ids, keys):
+            obj = self._state.get_cached(object_type, key)
+            if obj is None:
+                missing.append(object_id)
+            else:
+                found[key] = obj
+
+        def build(data: dict) -> Any:
+            return self._state.build_model(object_type, data)
+
+        if missing and self._state.persistent_cache is not None:
+            stored = await self._state.load_payloads(
+                object_type, [_cache_key(object_type, object_id) for object_id in missing])
+            for obj in await self._state.build_models(object_type, build, list(stored.values())):
+                obj = self._state.store(object_type, obj)
+                found[self._state.object_key(object_type, obj)] = obj
+            missing = [object_id for object_id in missing
+                       if _cache_key(object_type, object_id) not in found]
+
+        if missing:
+            fetched = {}
+            payloads = await self._fetch(object_type, missing, with_positions, fetcher)
+            for data, obj in zip(payloads, await self._state.build_models(object_type, build, payloads)):
+                obj = self._state.store(object_type, obj)
+                key = self._state.object_key(object_type, obj)
+                found[key] = obj
+                fetched[key] = data
+            await self._state.save_payloads(object_type, fetched)
+
+        return [found[key] for key in keys if key in found]
+
+    async def _build_playlist(self, data: PlaylistPayload) -> Playlist:
+        hooks = self._state.hooks
+        started = time.perf_counter() if hooks else 0.0
+        playlist = Playlist(self._state, data)
+        offloader = self._state.offloader
+        if offloader.should_offload(len(data.get('tracks') or [])):
+            await offloader.run(playlist._prepare_tracks, models=True)
+        if hooks:
+            hooks.emit('on_parse', 'playlist', 1, time.perf_counter() - started)
+        return playlist
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        return self._state.http.metrics
+
+    @property
+    def hooks(self) -> Hooks:
+        return self._state.hooks
+
+    async def close(self) -> None:
+        await self._state.flush_like_queues()
+        await self._state.http.close()
+
+    async def __aenter__(self) -> 'Client':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
     async def identify(self) -> None:
         self._state._identify(await self._state.http.get_account_info())
 
@@ -39,8 +188,8 @@ class Client:
         objtype = object_type+'s' if object_type != 'best' else object_type
         try:
             if object_type == 'best':
-                return self._state.de_list[json['best']['type']](self._state, json['best'])
-            results = [self._state.de_list[object_type](self._state, res)
+                return self._state.build_model(json['best']['type'], json['best'])
+            results = [self._state.build_model(object_type, res)
                        for res in json[objtype]['results']]
         except KeyError:
             raise NotFound(f'{object_type} not found', request=text)
@@ -49,13 +198,37 @@ class Client:
             return None if not results else results[0]
         return results
 
+    def iter_search(
+        self,
+        text: str,
+        object_type: Literal['track', 'album', 'artist', 'playlist'] = 'track',
+        nocorrect: bool = False
+    ) -> AsyncIterator[Union[Artist, Album, Track, Playlist]]:
+        objtype = object_type+'s'
+
+        def get_items(json: SearchPayload) -> List[Union[Artist, Album, Track, Playlist]]:
+            return [self._state.de_list[object_type](self._state, res)
+                    for res in json.get(objtype, {}).get('results', [])]
+
+        def get_pager(json: SearchPayload) -> Optional[PagerPayload]:
+            if objtype not in json:
+                return None
+            return {'page': json['page'], 'perPage': json[objtype]['perPage'], 'total': json[objtype]['total']}
+
+        return paginate(
+            lambda page: self._state.http.search(text, object_type, page, nocorrect),
+            get_items,
+            get_pager,
+            page_size=0
+        )
+
     async def get_playlist_from_userid(
         self,
         user_id: Union[int, str],
         playlist_id: Union[int, str]
     ) -> Playlist:
         data = await self._state.http.get_playlist(user_id, playlist_id)
-        return Playlist(self._state, data)
+        return await self._build_playlist(data)
 
     async def get_from_my_playlist(self, playlist_id: Union[int, str]) -> Playlist:
         uid = self._state.userid
@@ -69,7 +242,7 @@ class Client:
         rich_tracks: bool = False
     ) -> List[Playlist]:
         playlists = await self._state.http.get_playlists_from_user(user_id, playlist_id, mixed, rich_tracks)
-        return [Playlist(self._state, data) for data in playlists]
+        return [await self._build_playlist(data) for data in playlists]
 
     async def get_from_my_playlists(
         self,
@@ -85,7 +258,7 @@ class Client:
         user_id: int
     ) -> List[Playlist]:
         playlists = await self._state.http.get_user_playlists(user_id)
-        return [Playlist(self._state, data) for data in playlists]
+        return [await self._build_playlist(data) for data in playlists]
 
     async def get_my_playlist(self) -> List[Playlist]:
         uid = self._state.userid
@@ -98,12 +271,12 @@ class Client:
         with_positions: bool = True,
         with_only_result: bool = False
     ) -> Union[Playlist, List[Playlist]]:
-        data = await self._state.http.get_playlists(
+        results = await self._get_objects(
+            'playlist',
             playlist_ids,
-            with_positions
+            with_positions,
+            self._state.http.get_playlists
         )
-        results = [Playlist(self._state, playlist_data)
-                   for playlist_data in data]
 
         if with_only_result:
             return None if not results else results[0]
@@ -115,12 +288,12 @@ class Client:
         with_positions: bool = True,
         with_only_result: bool = False
     ) -> Union[Artist, List[Artist]]:
-        data = await self._state.http.get_artists(
+        results = await self._get_objects(
+            'artist',
             artists_ids,
-            with_positions
+            with_positions,
+            self._state.http.get_artists
         )
-        results = [Artist(self._state, playlist_data)
-                   for playlist_data in data]
 
         if with_only_result:
             return None if not results else results[0]
@@ -132,12 +305,12 @@ class Client:
         with_positions: bool = True,
         with_only_result: bool = False
     ) -> Union[Album, List[Album]]:
-        data = await self._state.http.get_albums(
+        results = await self._get_objects(
+            'album',
             album_ids,
-            with_positions
+            with_positions,
+            self._state.http.get_albums
         )
-        results = [Album(self._state, album_data)
-                   for album_data in data]
 
         if with_only_result:
             return None if not results else results[0]
@@ -149,24 +322,57 @@ class Client:
         with_positions: bool = True,
         with_only_result: bool = False
     ) -> Union[Track, List[Track]]:
-        data = await self._state.http.get_tracks(
+        results = await self._get_objects(
+            'track',
             track_ids,
-            with_positions
+            with_positions,
+            self._state.http.get_tracks
         )
-        results = [Track(self._state, track_data)
-                   for track_data in data]
 
         if with_only_result:
             return None if not results else results[0]
         return results
 
+    async def iter_hydrate_tracks(
+        self,
+        tracks: Iterable[Union[Track, ShortTrack, int, str]],
+        chunk_size: int = 100,
+        max_concurrency: int = 4
+    ) -> AsyncIterator[Track]:
+        track_ids = [str(getattr(track, 'id', track)) for track in tracks]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_chunk(chunk: List[str]) -> List[Track]:
+            async with semaphore:
+                return await self._get_objects('track', chunk, True, self._state.http.get_tracks)
+
+        tasks = [asyncio.create_task(fetch_chunk(track_ids[i:i+chunk_size]))
+                 for i in range(0, len(track_ids), chunk_size)]
+        try:
+            # chunks are fetched concurrently but yielded in the original order
+            for task in tasks:
+                for track in await task:
+                    yield track
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def hydrate_tracks(
+        self,
+        tracks: Iterable[Union[Track, ShortTrack, int, str]],
+        chunk_size: int = 100,
+        max_concurrency: int = 4
+    ) -> List[Track]:
+        return [track async for track in self.iter_hydrate_tracks(tracks, chunk_size, max_concurrency)]
+
     async def get_likes_tracks(self) -> List[ShortTrack]:
         userid = self._state.userid
 
         responce = await self._state.http.get_likes_tracks(userid)
         tracks_data = responce["library"]["tracks"]
 
-        return [ShortTrack(self._state, ltrd) for ltrd in tracks_data]
+        return await self._state.build_models(
+            'short_track', lambda ltrd: ShortTrack(self._state, ltrd), tracks_data)
 
     async def get_dislikes_tracks(self) -> List[ShortTrack]:
         userid = self._state.userid
@@ -174,14 +380,34 @@ class Client:
         responce = await self._state.http.get_dislikes_tracks(userid)
         tracks_data = responce['library']['tracks']
 
-        return [ShortTrack(self._state, ltrd) for ltrd in tracks_data]
+        return await self._state.build_models(
+            'short_track', lambda ltrd: ShortTrack(self._state, ltrd), tracks_data)
+
+    async def get_likes_table(self) -> TrackTable:
+        responce = await self._state.http.get_likes_tracks(self._state.userid)
+        return TrackTable.from_library(responce)
+
+    async def get_dislikes_table(self) -> TrackTable:
+        responce = await self._state.http.get_dislikes_tracks(self._state.userid)
+        return TrackTable.from_library(responce)
 
     async def like_tracks(self, tracks: Union[List[Union[Track, ShortTrack]], Track, ShortTrack]) -> None:
         tracks = tracks if isinstance(tracks, (list, set, tuple)) else [tracks]
         track_ids = [track.id for track in tracks]
+        queue = self._state.like_queue()
+        if queue is not None:
+            await asyncio.gather(*(queue.like(track_id) for track_id in track_ids))
+            return
         await self._state.http.like_track(self._state.userid, track_ids)
 
     async def dislike_tracks(self, tracks: Union[List[Union[Track, ShortTrack]], Track, ShortTrack]) -> None:
         tracks = tracks if isinstance(tracks, (list, set, tuple)) else [tracks]
         track_ids = [track.id for track in tracks]
-        await self._state.http.like_track(self._state.userid, track_ids)
+        queue = self._state.like_queue()
+        if queue is not None:
+            await asyncio.gather(*(queue.dislike(track_id) for track_id in track_ids))
+            return
+        await self._state.http.dislike_track(self._state.userid, track_ids)
+
+    async def flush_likes(self) -> None:
+        await self._state.flush_like_queues()
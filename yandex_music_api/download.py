@@ -0,0 +1,136 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Union
+
+import aiohttp
+
+from .exceptions import DownloadError, HTTPException
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
+DEFAULT_SEGMENT_SIZE = 1024 * 1024
+Target = Union[BinaryIO, bytearray, memoryview]
+
+
+class Segment:
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+        self.received = 0
+
+    @property
+    def offset(self) -> int:
+        return self.start + self.received
+
+    @property
+    def done(self) -> bool:
+        return self.offset > self.end
+
+    def __repr__(self) -> str:
+        return f"<Segment start={self.start} end={self.end} received={self.received}>"
+
+
+class RangedDownload:
+    def __init__(
+        self,
+        http: HTTPClient,
+        url: str,
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        chunk_size: int = 64 * 1024
+    ) -> None:
+        self.http = http
+        self.url = url
+        self.segment_size = segment_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.size: Optional[int] = None
+        self.segments: List[Segment] = []
+
+    async def prepare(self) -> Optional[int]:
+        if self.size is None:
+            self.size = await self.http.get_audio_size(self.url)
+            if self.size:
+                self.segments = [
+                    Segment(start, min(start + self.segment_size, self.size) - 1)
+                    for start in range(0, self.size, self.segment_size)
+                ]
+        return self.size
+
+    async def into(self, target: Target) -> int:
+        size = await self.prepare()
+        if not size:
+            # the host does not support ranges, fall back to a single stream
+            offset = 0
+            async for chunk in self.http.stream_audio(self.url, self.chunk_size):
+                self._write(target, offset, chunk)
+                offset += len(chunk)
+            return offset
+
+        # segments finish out of order, so every offset has to exist up front
+        if isinstance(target, bytearray):
+            if len(target) < size:
+                target[len(target):] = bytes(size - len(target))
+        elif isinstance(target, memoryview):
+            if len(target) < size:
+                raise ValueError(f"buffer of {len(target)} bytes is too small for {size} bytes")
+        else:
+            target.truncate(size)
+
+        # segments finished by a previous call are skipped, so calling
+        # into() again after a DownloadError resumes the download
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(
+            *(self._fetch(segment, target, semaphore)
+              for segment in self.segments if not segment.done),
+            return_exceptions=True
+        )
+
+        remaining = sum(not segment.done for segment in self.segments)
+        if remaining:
+            raise DownloadError(self.url, remaining)
+        return size
+
+    async def read(self) -> bytearray:
+        size = await self.prepare()
+        buffer = bytearray(size or 0)
+        if size:
+            await self.into(buffer)
+        else:
+            async for chunk in self.http.stream_audio(self.url, self.chunk_size):
+                buffer += chunk
+        return buffer
+
+    async def _fetch(self, segment: Segment, target: Target, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            for tries in range(self.max_retries + 1):
+                headers = {"Range": f"bytes={segment.offset}-{segment.end}"}
+                try:
+                    stream = self.http.stream_audio(self.url, self.chunk_size, headers)
+                    async with contextlib.aclosing(stream):
+                        async for chunk in stream:
+                            chunk = chunk[:segment.end - segment.offset + 1]
+                            self._write(target, segment.offset, chunk)
+                            segment.received += len(chunk)
+                            if segment.done:
+                                break
+                except (aiohttp.ClientError, asyncio.TimeoutError, HTTPException):
+                    if tries >= self.max_retries:
+                        raise
+
+                if segment.done:
+                    return
+                await asyncio.sleep(self.http._get_backoff(tries))
+
+    @staticmethod
+    def _write(target: Target, offset: int, chunk: bytes) -> None:
+        if isinstance(target, (bytearray, memoryview)):
+            target[offset:offset + len(chunk)] = chunk
+        else:
+            target.seek(offset)
+            target.write(chunk)
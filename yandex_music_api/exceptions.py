@@ -48,3 +48,10 @@ class NotFound(YandexMusicException):
 class BitrateNotFound(YandexMusicException):
     def __init__(self, bitrateInKbps: int) -> None:
         super().__init__(f"Bitrate {bitrateInKbps} not found.")
+
+
+class DownloadError(YandexMusicException):
+    def __init__(self, url: str, remaining: int) -> None:
+        super().__init__(f"{remaining} segments of {url} failed to download.")
+        self.url = url
+        self.remaining = remaining
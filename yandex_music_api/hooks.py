@@ -0,0 +1,143 @@
+import logging
+import time
+from typing import Any, Callable, List, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+_log = logging.getLogger(__name__)
+
+EVENTS = ('before_request', 'after_response', 'on_retry', 'on_parse')
+
+
+class RequestEvent:
+    """One logical request. The timings are for its latest attempt, in seconds."""
+
+    __slots__ = ('route', 'method', 'url', 'tries', 'status', 'error',
+                 'started', 'queued', 'network', 'decode')
+
+    def __init__(self, route: str, method: str, url: str) -> None:
+        self.route = route
+        self.method = method
+        self.url = url
+        self.tries = 0
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        # wall clock start of the attempt in ns, as spans expect it
+        self.started = 0
+        # time spent behind the bucket lock and the global concurrency limit
+        self.queued = 0.0
+        self.network = 0.0
+        self.decode = 0.0
+
+    def start_attempt(self) -> None:
+        self.started = time.time_ns()
+        self.status = None
+        self.error = None
+        self.queued = self.network = self.decode = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.queued + self.network + self.decode
+
+    def __repr__(self) -> str:
+        return f"<RequestEvent {self.route} tries={self.tries} status={self.status}>"
+
+
+class Hooks:
+    """Callbacks for the request lifecycle and model construction.
+
+    Handlers are called synchronously on the event loop::
+
+        before_request(event, kwargs)  # kwargs are passed on to the transport
+        after_response(event)  # every attempt, event.error is set if it failed on the wire
+        on_retry(event, delay)
+        on_parse(object_type, count, elapsed)
+
+    A failing handler is logged and never breaks the request.
+    """
+
+    __slots__ = EVENTS
+
+    def __init__(self) -> None:
+        self.before_request: List[Callable[..., Any]] = []
+        self.after_response: List[Callable[..., Any]] = []
+        self.on_retry: List[Callable[..., Any]] = []
+        self.on_parse: List[Callable[..., Any]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.before_request or self.after_response or self.on_retry or self.on_parse)
+
+    def add(self, event: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        if event not in EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}")
+        getattr(self, event).append(func)
+        return func
+
+    def remove(self, event: str, func: Callable[..., Any]) -> None:
+        getattr(self, event).remove(func)
+
+    def emit(self, event: str, *args: Any) -> None:
+        for func in getattr(self, event):
+            try:
+                func(*args)
+            except Exception:
+                _log.exception("%s hook %r failed", event, func)
+
+
+class Tracing:
+    """Turns hook events into OpenTelemetry spans.
+
+    Spans are created after the fact with explicit timestamps, so they become
+    children of whatever span is current where the request was awaited.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None) -> None:
+        if otel_trace is None:
+            raise RuntimeError("opentelemetry-api is required for tracing")
+        self.tracer = tracer or otel_trace.get_tracer(__name__)
+
+    def attach(self, hooks: Hooks) -> 'Tracing':
+        hooks.add('after_response', self.after_response)
+        hooks.add('on_parse', self.on_parse)
+        return self
+
+    def detach(self, hooks: Hooks) -> None:
+        hooks.remove('after_response', self.after_response)
+        hooks.remove('on_parse', self.on_parse)
+
+    def _span(self, name: str, start: int, duration: float, parent: Optional[Any] = None, **attributes: Any) -> Any:
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        span = self.tracer.start_span(name, context=context, start_time=start, attributes=attributes)
+        span.end(end_time=start + int(duration * 1e9))
+        return span
+
+    def _request_span(self, event: RequestEvent) -> Any:
+        span = self.tracer.start_span(event.route, start_time=event.started, attributes={
+            'http.method': event.method,
+            'http.url': event.url,
+            'yandex_music.tries': event.tries
+        })
+        if event.status is not None:
+            span.set_attribute('http.status_code', event.status)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+
+        start = event.started
+        for phase in ('queued', 'network', 'decode'):
+            duration = getattr(event, phase)
+            if duration:
+                self._span(phase, start, duration, span)
+                start += int(duration * 1e9)
+        span.end(end_time=event.started + int(event.elapsed * 1e9))
+        return span
+
+    def after_response(self, event: RequestEvent) -> None:
+        self._request_span(event)
+
+    def on_parse(self, object_type: str, count: int, elapsed: float) -> None:
+        self._span(f'parse {object_type}', time.time_ns() - int(elapsed * 1e9), elapsed,
+                   **{'yandex_music.count': count})
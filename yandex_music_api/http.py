@@ -1,8 +1,10 @@
 import asyncio
+import random
+import time
 from types import TracebackType
-from typing import Any, ClassVar, Coroutine, Dict, List, Literal, Optional, Self, Type, Union
+from typing import Any, AsyncIterator, ClassVar, Coroutine, Dict, List, Literal, Optional, Self, Type, Union
 
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
 import aiohttp
 import sys
@@ -16,6 +18,10 @@ from .types import (
     SimilarTracksPayload, SupplementPayload, TrackDownloadinfoPayload,
     TrackPayload
 )
+from .hooks import Hooks, RequestEvent
+from .metrics import Metrics, RouteMetrics
+from .offload import Offloader
+from .transport import Transport
 from . import util
 from . import __version__
 
@@ -23,17 +29,32 @@ _USER_AGENT = "YandexMusicClient (https://github.com/lordcod/yandex-music-api/ {
     __version__, sys.version_info, aiohttp.__version__
 )
 
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
 
-async def json_or_text(response: aiohttp.ClientResponse) -> Union[Dict[str, Any], str]:
-    text = await response.text(encoding="utf-8")
+
+async def json_or_text(
+    response: aiohttp.ClientResponse,
+    offloader: Optional[Offloader] = None
+) -> Union[Dict[str, Any], str]:
+    return await decode_body(response, await response.read(), offloader)
+
+
+async def decode_body(
+    response: aiohttp.ClientResponse,
+    body: bytes,
+    offloader: Optional[Offloader] = None
+) -> Union[Dict[str, Any], str]:
+    # orjson parses the raw body, so it is never decoded into an intermediate str
     try:
         if "application/json" in response.headers["content-type"]:
-            return util.from_json(text)
+            if offloader is None:
+                return util.from_json(body)
+            return await offloader.decode_json(body)
     except KeyError:
         # Thanks Cloudflare
         pass
 
-    return text
+    return body.decode("utf-8")
 
 
 def parse_params(params: dict):
@@ -46,6 +67,18 @@ def parse_params(params: dict):
     return new_params
 
 
+def _body_size(data: Any) -> int:
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode())
+    if isinstance(data, dict):
+        return len(urlencode(data))
+    return 0
+
+
 class Route:
     BASE: ClassVar[str] = "https://api.music.yandex.net"
 
@@ -60,6 +93,10 @@ class Route:
             )
         self.url: str = url
 
+    @property
+    def bucket(self) -> str:
+        return f"{self.method} {self.path}"
+
 
 class MaybeUnlock:
     def __init__(self, lock: asyncio.Lock) -> None:
@@ -87,12 +124,31 @@ class HTTPClient:
 
     def __init__(
         self,
-        session: aiohttp.ClientSession,
-        loop: asyncio.AbstractEventLoop
+        session: Optional[aiohttp.ClientSession] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        *,
+        max_concurrency: int = 64,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        offloader: Optional[Offloader] = None,
+        transport: Optional[Transport] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[Hooks] = None
     ) -> None:
-        self.__session = session
+        self.transport = transport or Transport()
+        if session is not None and self.transport.session is None:
+            self.transport.session = session
         self.loop = loop
-        self._locks: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._inflight = util.SingleFlight()
+        self.offloader = offloader or Offloader()
+        self.metrics = metrics
+        self.hooks = hooks if hooks is not None else Hooks()
         self.user_agent = _USER_AGENT
         self.music_agent = 'YandexMusicAndroid/1011570100'
 
@@ -101,9 +157,19 @@ class HTTPClient:
         route: Route,
         **kwargs: Any
     ):
-        method = route.method
-        url = route.url
+        if route.method != "GET" or kwargs.keys() - {"params"}:
+            return await self._request(route, **kwargs)
+
+        # identical GETs that are already in flight share one response
+        params = parse_params(kwargs.get("params", {}))
+        key = (route.url, tuple(sorted(params.items())))
+        return await self._inflight.do(key, lambda: self._request(route, **kwargs))
 
+    async def _request(
+        self,
+        route: Route,
+        **kwargs: Any
+    ):
         # header creation
         headers: Dict[str, str] = {
             "User-Agent": self.user_agent,
@@ -122,32 +188,150 @@ class HTTPClient:
 
         kwargs["headers"] = headers
 
+        lock = self._locks.get(route.bucket)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[route.bucket] = lock
+
+        event = None
+        if self.hooks:
+            event = RequestEvent(route.bucket, route.method, route.url)
+            self.hooks.emit("before_request", event, kwargs)
+
+        if self.metrics is None:
+            return await self._send(route, lock, kwargs, event=event)
+
+        stats = self.metrics.route(route.bucket)
+        stats.requests += 1
+        started = time.perf_counter()
+        try:
+            return await self._send(route, lock, kwargs, stats, event)
+        finally:
+            stats.latency.observe(time.perf_counter() - started)
+
+    async def _send(
+        self,
+        route: Route,
+        lock: asyncio.Lock,
+        kwargs: Dict[str, Any],
+        stats: Optional[RouteMetrics] = None,
+        event: Optional[RequestEvent] = None
+    ):
+        method = route.method
+        url = route.url
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-
-        async with self.__session.request(method, url, **kwargs) as response:
-            data = await json_or_text(response)
-
-            if 300 > response.status >= 200:
-                if isinstance(data, str):
-                    return data
-                return data['result']
-
-            # we are being rate limited
-            if response.status == 429:
-                if not response.headers.get("Via") or isinstance(data, str):
-                    # Banned by Cloudflare more than likely.
-                    raise HTTPException(response, data)
-
-            # the usual error cases
-            if response.status == 403:
-                raise Forbidden(response, data)
-            elif response.status == 404:
-                raise HTTPNotFound(response, data)
-            elif response.status >= 500:
-                raise YandexMusicServerError(response, data)
-            else:
-                raise HTTPException(response, data)
+        mark = 0.0
+
+        for tries in range(self.max_retries + 1):
+            if event is not None:
+                event.tries = tries + 1
+                event.start_attempt()
+                mark = time.perf_counter()
+
+            # a rate limited bucket stays locked until its Retry-After passes
+            async with lock:
+                pass
+
+            can_retry = tries < self.max_retries
+            # a POST that failed on the server or the wire may still have been applied
+            can_retry_failure = can_retry and method in _IDEMPOTENT_METHODS
+            try:
+                async with self._global_limit:
+                    if event is not None:
+                        now = time.perf_counter()
+                        event.queued, mark = now - mark, now
+                    async with self.transport.request(method, url, **kwargs) as response:
+                        body = await response.read()
+                        if event is not None:
+                            now = time.perf_counter()
+                            event.network, mark = now - mark, now
+                        data = await decode_body(response, body, self.offloader)
+                        if event is not None:
+                            event.decode = time.perf_counter() - mark
+                            event.status = response.status
+                            self.hooks.emit("after_response", event)
+                        if stats is not None:
+                            self._record(stats, response.status, body, data, kwargs.get("data"))
+
+                        if 300 > response.status >= 200:
+                            if isinstance(data, str):
+                                return data
+                            return data['result']
+
+                        # we are being rate limited
+                        if response.status == 429 and can_retry:
+                            if stats is not None:
+                                stats.retries += 1
+                            delay = self._get_retry_after(response, tries)
+                            if event is not None:
+                                self.hooks.emit("on_retry", event, delay)
+                            await self._cooldown(lock, delay)
+                            continue
+
+                        if response.status >= 500 and can_retry_failure:
+                            delay = self._get_backoff(tries)
+                        # the usual error cases
+                        elif response.status == 403:
+                            raise Forbidden(response, data)
+                        elif response.status == 404:
+                            raise HTTPNotFound(response, data)
+                        elif response.status >= 500:
+                            raise YandexMusicServerError(response, data)
+                        else:
+                            raise HTTPException(response, data)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                if stats is not None:
+                    stats.errors += 1
+                if event is not None:
+                    event.network = time.perf_counter() - mark
+                    event.error = exc
+                    self.hooks.emit("after_response", event)
+                if not can_retry_failure:
+                    raise
+                delay = self._get_backoff(tries)
+
+            if stats is not None:
+                stats.retries += 1
+            if event is not None:
+                self.hooks.emit("on_retry", event, delay)
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _record(
+        stats: RouteMetrics,
+        status: int,
+        body: bytes,
+        data: Union[Dict[str, Any], str],
+        sent: Any
+    ) -> None:
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.bytes_in += len(body)
+        stats.bytes_out += _body_size(sent)
+        if isinstance(data, dict):
+            duration = data.get("invocationInfo", {}).get("exec-duration-millis")
+            if duration is not None:
+                stats.server_latency.observe(duration / 1000)
+
+    def _get_backoff(self, tries: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** tries)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _get_retry_after(self, response: aiohttp.ClientResponse, tries: int) -> float:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return self._get_backoff(tries)
+
+    async def _cooldown(self, lock: asyncio.Lock, delay: float) -> None:
+        if lock.locked():
+            # another request has already put this bucket on hold
+            return
+        await lock.acquire()
+        asyncio.get_running_loop().call_later(delay, lock.release)
+
+    async def close(self) -> None:
+        await self.transport.close()
 
     # ? Playlist
 
@@ -223,17 +407,17 @@ class HTTPClient:
 
     # ? Like/Dislike
 
-    def get_likes_tracks(self, userid: int) -> Coroutine[Any, Any, LibraryPlaylistPayload]:
+    def get_likes_tracks(self, userid: int, if_modified_since_revision: int = 0) -> Coroutine[Any, Any, LibraryPlaylistPayload]:
         route = Route(
             "GET", "/users/{userid}/likes/tracks", userid=userid)
+        params = {'if-modified-since-revision': if_modified_since_revision}
+        return self.request(route, params=params)
 
-        return self.request(route)
-
-    def get_dislikes_tracks(self, userid: int) -> Coroutine[Any, Any, LibraryPlaylistPayload]:
+    def get_dislikes_tracks(self, userid: int, if_modified_since_revision: int = 0) -> Coroutine[Any, Any, LibraryPlaylistPayload]:
         route = Route(
             "GET", "/users/{userid}/dislikes/tracks", userid=userid)
-
-        return self.request(route)
+        params = {'if-modified-since-revision': if_modified_since_revision}
+        return self.request(route, params=params)
 
     def like_track(
         self,
@@ -267,22 +451,22 @@ class HTTPClient:
 
     def get_download_info(self, track_id: int) -> Coroutine[Any, Any, List[TrackDownloadinfoPayload]]:
         route = Route(
-            'GET', f'/tracks/{track_id}/download-info', track_id=track_id)
+            'GET', '/tracks/{track_id}/download-info', track_id=track_id)
         return self.request(route)
 
     def get_track_additionally_info(self, track_id: int) -> Coroutine[Any, Any, SupplementPayload]:
         route = Route(
-            'GET', f'/tracks/{track_id}/supplement', track_id=track_id)
+            'GET', '/tracks/{track_id}/supplement', track_id=track_id)
         return self.request(route)
 
     def get_similar_track(self, track_id: int) -> Coroutine[Any, Any, SimilarTracksPayload]:
         route = Route(
-            'GET', f'/tracks/{track_id}/similar', track_id=track_id)
+            'GET', '/tracks/{track_id}/similar', track_id=track_id)
         return self.request(route)
 
     def get_track_lyrics(self, track_id: int, timestamp: int, sign: str):
         route = Route(
-            'GET', f'/tracks/{track_id}/lyrics', track_id=track_id)
+            'GET', '/tracks/{track_id}/lyrics', track_id=track_id)
         params = {
             'timeStamp': timestamp,
             'sign': sign
@@ -374,7 +558,7 @@ class HTTPClient:
         return self.request(route, params=params)
 
     async def get_from_downloadinfo(self, url: str) -> bytes:
-        async with self.__session.get(url) as resp:
+        async with self.transport.request("GET", url, audio=True) as resp:
             if resp.status == 200:
                 return await resp.read()
             elif resp.status == 404:
@@ -383,3 +567,29 @@ class HTTPClient:
                 raise Forbidden(resp, "cannot retrieve download info")
             else:
                 raise HTTPException(resp, "failed to get download info")
+
+    async def stream_audio(
+        self,
+        url: str,
+        chunk_size: int = 64 * 1024,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[bytes]:
+        async with self.transport.request("GET", url, audio=True, headers=headers) as resp:
+            if resp.status == 404:
+                raise HTTPNotFound(resp, "audio not found")
+            elif resp.status == 403:
+                raise Forbidden(resp, "cannot retrieve audio")
+            elif resp.status not in (200, 206):
+                raise HTTPException(resp, "failed to get audio")
+            elif headers and "Range" in headers and resp.status != 206:
+                # a plain 200 starts at byte 0, not at the requested offset
+                raise HTTPException(resp, "host ignored the Range header")
+
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def get_audio_size(self, url: str) -> Optional[int]:
+        async with self.transport.request("HEAD", url, audio=True, allow_redirects=True) as resp:
+            if resp.status != 200 or resp.headers.get("Accept-Ranges") != "bytes":
+                return None
+            return resp.content_length
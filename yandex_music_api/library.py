@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, NamedTuple, Optional
+
+from .track import ShortTrack
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .track import Track
+
+
+class LibraryChanges(NamedTuple):
+    added: List[ShortTrack]
+    removed: List[int]
+    revision: int
+
+
+class LibrarySync:
+    def __init__(
+        self,
+        client: Client,
+        kind: Literal['likes', 'dislikes'] = 'likes',
+        *,
+        revision: int = 0,
+        tracks: Optional[Dict[int, str]] = None
+    ) -> None:
+        self.client = client
+        self.kind = kind
+        self.revision = revision
+        # track id -> timestamp it was added at
+        self.tracks: Dict[int, str] = tracks or {}
+
+    async def sync(self) -> LibraryChanges:
+        state = self.client._state
+        fetch = state.http.get_likes_tracks if self.kind == 'likes' else state.http.get_dislikes_tracks
+        library = (await fetch(state.userid, self.revision))['library']
+
+        if 'tracks' not in library:
+            # nothing changed since our revision
+            return LibraryChanges([], [], self.revision)
+
+        tracks = {int(data['id']): data for data in library['tracks']}
+        added = [ShortTrack(state, data) for track_id, data in tracks.items()
+                 if self.tracks.get(track_id) != data['timestamp']]
+        removed = [track_id for track_id in self.tracks if track_id not in tracks]
+
+        self.tracks = {track_id: data['timestamp'] for track_id, data in tracks.items()}
+        self.revision = library.get('revision', self.revision)
+        return LibraryChanges(added, removed, self.revision)
+
+    async def hydrate(self, changes: LibraryChanges, chunk_size: int = 100, max_concurrency: int = 4) -> List[Track]:
+        return await self.client.hydrate_tracks(changes.added, chunk_size, max_concurrency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'revision': self.revision,
+            'tracks': {str(track_id): timestamp for track_id, timestamp in self.tracks.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, client: Client, data: Dict[str, Any]) -> LibrarySync:
+        return cls(
+            client,
+            data['kind'],
+            revision=data['revision'],
+            tracks={int(track_id): timestamp for track_id, timestamp in data['tracks'].items()}
+        )
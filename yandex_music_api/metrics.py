@@ -0,0 +1,215 @@
+import bisect
+import logging
+import os
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+# seconds, shared by the client side and the server side histograms
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_log = logging.getLogger(__name__)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # the last slot counts observations above the largest bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        result = []
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+
+class RouteMetrics:
+    __slots__ = ('route', 'requests', 'statuses', 'retries', 'errors',
+                 'bytes_in', 'bytes_out', 'latency', 'server_latency')
+
+    def __init__(self, route: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.route = route
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.retries = 0
+        # connection errors and timeouts, which have no status code
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = Histogram(buckets)
+        self.server_latency = Histogram(buckets)
+
+    def to_dict(self) -> dict:
+        return {
+            'route': self.route,
+            'requests': self.requests,
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'errors': self.errors,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'latency': {'count': self.latency.count, 'sum': self.latency.sum,
+                        'p50': self.latency.quantile(0.5), 'p99': self.latency.quantile(0.99)},
+            'server_latency': {'count': self.server_latency.count, 'sum': self.server_latency.sum,
+                               'p50': self.server_latency.quantile(0.5),
+                               'p99': self.server_latency.quantile(0.99)}
+        }
+
+
+class MetricsExporter(Protocol):
+    def export(self, metrics: 'Metrics') -> None:
+        ...
+
+
+class Metrics:
+    def __init__(
+        self,
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        exporters: Optional[List[MetricsExporter]] = None
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.exporters = exporters or []
+        self.routes: Dict[str, RouteMetrics] = {}
+
+    def route(self, route: str) -> RouteMetrics:
+        metrics = self.routes.get(route)
+        if metrics is None:
+            metrics = self.routes[route] = RouteMetrics(route, self.buckets)
+        return metrics
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {route: metrics.to_dict() for route, metrics in self.routes.items()}
+
+    def export(self) -> None:
+        for exporter in self.exporters:
+            exporter.export(self)
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+class InMemoryExporter:
+    def __init__(self, maxlen: int = 100) -> None:
+        self.maxlen = maxlen
+        self.snapshots: List[Dict[str, dict]] = []
+
+    def export(self, metrics: Metrics) -> None:
+        self.snapshots.append(metrics.snapshot())
+        del self.snapshots[:-self.maxlen]
+
+    @property
+    def last(self) -> Optional[Dict[str, dict]]:
+        return self.snapshots[-1] if self.snapshots else None
+
+
+class LoggingExporter:
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or _log
+        self.level = level
+
+    def export(self, metrics: Metrics) -> None:
+        for route, data in sorted(metrics.routes.items()):
+            self.logger.log(
+                self.level,
+                '%s: %d requests, %d retries, %d errors, statuses %s, %d B in, %d B out, '
+                'p50 %.3fs p99 %.3fs, server p50 %.3fs',
+                route, data.requests, data.retries, data.errors, data.statuses,
+                data.bytes_in, data.bytes_out, data.latency.quantile(0.5),
+                data.latency.quantile(0.99), data.server_latency.quantile(0.5)
+            )
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {count}'
+             for bound, count in histogram.cumulative()]
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+def to_prometheus(metrics: Metrics, prefix: str = 'yandex_music') -> str:
+    """Renders the metrics in the Prometheus text exposition format."""
+    sections: Dict[str, Tuple[str, List[str]]] = {
+        'requests_total': ('counter', []),
+        'responses_total': ('counter', []),
+        'retries_total': ('counter', []),
+        'errors_total': ('counter', []),
+        'received_bytes_total': ('counter', []),
+        'sent_bytes_total': ('counter', []),
+        'request_duration_seconds': ('histogram', []),
+        'server_duration_seconds': ('histogram', [])
+    }
+
+    for route, data in sorted(metrics.routes.items()):
+        labels = f'route="{_escape(route)}"'
+        sections['requests_total'][1].append(f'{prefix}_requests_total{{{labels}}} {data.requests}')
+        for status, count in sorted(data.statuses.items()):
+            sections['responses_total'][1].append(
+                f'{prefix}_responses_total{{{labels},status="{status}"}} {count}')
+        sections['retries_total'][1].append(f'{prefix}_retries_total{{{labels}}} {data.retries}')
+        sections['errors_total'][1].append(f'{prefix}_errors_total{{{labels}}} {data.errors}')
+        sections['received_bytes_total'][1].append(
+            f'{prefix}_received_bytes_total{{{labels}}} {data.bytes_in}')
+        sections['sent_bytes_total'][1].append(f'{prefix}_sent_bytes_total{{{labels}}} {data.bytes_out}')
+        sections['request_duration_seconds'][1].extend(
+            _histogram_lines(f'{prefix}_request_duration_seconds', labels, data.latency))
+        sections['server_duration_seconds'][1].extend(
+            _histogram_lines(f'{prefix}_server_duration_seconds', labels, data.server_latency))
+
+    lines = []
+    for name, (kind, samples) in sections.items():
+        lines.append(f'# TYPE {prefix}_{name} {kind}')
+        lines.extend(samples)
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusExporter:
+    def __init__(self, path: Optional[str] = None, prefix: str = 'yandex_music') -> None:
+        self.path = path
+        self.prefix = prefix
+        self.text = ''
+
+    def export(self, metrics: Metrics) -> None:
+        self.text = to_prometheus(metrics, self.prefix)
+        if self.path is not None:
+            # the textfile collector must never see a half written file
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as file:
+                file.write(self.text)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from . import util
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class OffloadStats(NamedTuple):
+    offloaded: int
+    inline: int
+    worker_seconds: float
+
+
+def _timed(func: Callable[..., R], *args: Any) -> Tuple[R, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class Offloader:
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        *,
+        json_threshold: int = 1024 * 1024,
+        items_threshold: int = 1000
+    ) -> None:
+        self.executor = executor
+        self.json_threshold = json_threshold
+        self.items_threshold = items_threshold
+        self.offloaded = 0
+        self.inline = 0
+        self.worker_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.executor is not None
+
+    def should_offload(self, size: int) -> bool:
+        return self.executor is not None and size >= self.items_threshold
+
+    def stats(self) -> OffloadStats:
+        return OffloadStats(self.offloaded, self.inline, self.worker_seconds)
+
+    async def run(self, func: Callable[..., R], *args: Any, models: bool = False) -> R:
+        loop = asyncio.get_running_loop()
+        executor = self.model_executor() if models else self.executor
+        result, elapsed = await loop.run_in_executor(executor, _timed, func, *args)
+        self.offloaded += 1
+        # time spent in the worker, not time the loop was freed: pure python work
+        # in a thread pool still holds the GIL, only a process pool runs truly in parallel
+        self.worker_seconds += elapsed
+        return result
+
+    async def decode_json(self, body: bytes) -> Any:
+        if not self.enabled or len(body) < self.json_threshold:
+            self.inline += 1
+            return util.from_json(body)
+        return await self.run(util.from_json, body)
+
+    async def build(self, func: Callable[[T], R], items: List[T]) -> List[R]:
+        if not self.should_offload(len(items)):
+            self.inline += 1
+            return [func(item) for item in items]
+        return await self.run(_build_all, func, items, models=True)
+
+    def model_executor(self) -> Optional[Executor]:
+        # models hold a reference to the connection state and can't leave the process,
+        # they are built in the default thread pool instead
+        return None if isinstance(self.executor, ProcessPoolExecutor) else self.executor
+
+
+def _build_all(func: Callable[[T], R], items: List[T]) -> List[R]:
+    return [func(item) for item in items]
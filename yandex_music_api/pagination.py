@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+
+from .types import PagerPayload
+
+T = TypeVar('T')
+
+
+def has_next_page(pager: Optional[PagerPayload], page: int, count: int, page_size: int) -> bool:
+    if not count:
+        return False
+    if pager is None:
+        return count >= page_size
+    return (page + 1) * pager['perPage'] < pager['total']
+
+
+async def paginate(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    get_items: Callable[[Any], List[T]],
+    get_pager: Callable[[Any], Optional[PagerPayload]],
+    page_size: int,
+    page: int = 0
+) -> AsyncIterator[T]:
+    task: Optional[asyncio.Task] = asyncio.create_task(fetch_page(page))
+    try:
+        while task is not None:
+            payload = await task
+            task = None
+
+            items = get_items(payload)
+            if has_next_page(get_pager(payload), page, len(items), page_size):
+                # the next page is fetched while the caller consumes this one
+                task = asyncio.create_task(fetch_page(page + 1))
+            page += 1
+
+            for item in items:
+                yield item
+    finally:
+        if task is not None:
+            task.cancel()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 import contextlib
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-from yandex_music_api.types import PlaylistPayload
+from yandex_music_api.types import PlaylistPayload, TrackItemPayload
 
 if TYPE_CHECKING:
     from yandex_music_api.state import ConnectionState
-    from yandex_music_api.track import Track
+    from yandex_music_api.track import ShortTrack, Track
     from yandex_music_api.util import Difference, VisibilityType
 
 
 class Playlist:
+    __slots__ = (
+        '_state', 'data', 'revision', 'owner', 'id', 'kind', 'title', 'description',
+        'tags', 'track_count', '_tracks', '_by_position', '_positions', '__weakref__'
+    )
+
     def __init__(self, state: ConnectionState, data: PlaylistPayload) -> None:
         self._state = state
         self.data = data
@@ -22,22 +27,117 @@ class Playlist:
         self.description = data.get('description')
         self.tags = data.get('tags')
         self.track_count = data['trackCount']
+        self._tracks: Optional[List[Track]] = None
+        self._by_position: Dict[int, Track] = {}
+        self._positions: Optional[Dict[int, List[int]]] = None
 
     @property
     def tracks(self) -> List[Track]:
-        ret = []
-        for track_item in self.data.get('tracks'):
+        if self._tracks is None:
+            self._prepare_tracks()
+        return self._tracks
+
+    def _prepare_tracks(self, reuse: Optional[Dict[int, Track]] = None) -> None:
+        tracks = []
+        by_position = {}
+        for position, track_item in enumerate(self.data.get('tracks') or []):
+            if track_item.get('track') is None:
+                continue
             with contextlib.suppress(KeyError):
-                track = self._state.de_list['track'](
-                    self._state, track_item.get('track'))
-                ret.append(track)
-        return ret
+                track = (reuse or {}).get(int(track_item['track']['id']))
+                if track is None:
+                    track = self._state.de_list['track'](
+                        self._state, track_item['track'])
+                tracks.append(track)
+                by_position[position] = track
+        self._tracks = tracks
+        self._by_position = by_position
+
+    def _get_positions(self) -> Dict[int, List[int]]:
+        if self._positions is None:
+            positions = {}
+            for position, track_item in enumerate(self.data.get('tracks') or []):
+                track_id = track_item.get('id') or (track_item.get('track') or {}).get('id')
+                if track_id is not None:
+                    positions.setdefault(int(track_id), []).append(position)
+            self._positions = positions
+        return self._positions
+
+    def _update(self, data: PlaylistPayload) -> None:
+        revision = self.revision
+        cached = (self._tracks, self._by_position, self._positions)
+        self.__init__(self._state, {**self.data, **data})
+        # materialized tracks stay valid until the revision or the track list changes
+        if self.revision == revision and 'tracks' not in data:
+            self._tracks, self._by_position, self._positions = cached
+
+    def __contains__(self, track: Union[Track, ShortTrack, int, str]) -> bool:
+        return int(getattr(track, 'id', track)) in self._get_positions()
+
+    def positions(self, track: Union[Track, ShortTrack, int, str]) -> List[int]:
+        return list(self._get_positions().get(int(getattr(track, 'id', track)), []))
+
+    def index(self, track: Union[Track, ShortTrack, int, str]) -> int:
+        positions = self._get_positions().get(int(getattr(track, 'id', track)))
+        if not positions:
+            raise ValueError(f'{track!r} is not in the playlist')
+        return positions[0]
+
+    def track_at(self, position: int) -> Optional[Track]:
+        if self._tracks is None:
+            self._prepare_tracks()
+        return self._by_position.get(position)
 
     async def delete(self) -> None:
         await self._state.http.delete_playlist(self.id, self.kind)
 
     async def edit_tracks(self, diff: Difference) -> None:
-        await self._state.http.edit_playlist_tracks(self.id, self.kind, diff.payload, self.revision)
+        data = await self._state.http.edit_playlist_tracks(self.id, self.kind, diff.payload, self.revision)
+        if not isinstance(data, dict):
+            return
+        if 'tracks' in data or self.data.get('tracks') is None:
+            # a copy from /playlists/list has no tracks to replay the edit on, sync() fetches them
+            self._update(data)
+        else:
+            # the edit went through, replay it on our copy instead of refetching
+            await self._replace_tracks(data, self._apply_difference(diff))
+
+    async def sync(self) -> bool:
+        http = self._state.http
+        playlists = await http.get_playlists([f'{self.id}:{self.kind}'], False)
+        if playlists and playlists[0].get('revision', 0) == self.revision and self.data.get('tracks') is not None:
+            return False
+
+        # only ids and album ids, the full tracks are hydrated for new ids alone
+        data, = await http.get_playlists_from_user(self.id, [str(self.kind)])
+        await self._replace_tracks(data, data.get('tracks') or [])
+        return True
+
+    def _apply_difference(self, diff: Difference) -> List[TrackItemPayload]:
+        items = list(self.data.get('tracks') or [])
+        operations = diff.payload['diff']
+        for operation in operations if isinstance(operations, list) else [operations]:
+            if operation['op'] == 'insert':
+                items[operation['at']:operation['at']] = [
+                    {'id': track['id'], 'albumId': track['albumId']} for track in operation['tracks']]
+            elif operation['op'] == 'delete':
+                del items[operation['from']:operation['to']]
+        return items
+
+    async def _replace_tracks(self, data: PlaylistPayload, items: List[TrackItemPayload]) -> None:
+        known = {int(item['id']): item['track']
+                 for item in self.data.get('tracks') or [] if item.get('track')}
+        reuse = {track.id: track for track in self._tracks or []}
+
+        missing = [str(item['id']) for item in items if int(item['id']) not in known]
+        if missing:
+            for track in await self._state.client.hydrate_tracks(missing):
+                known[track.id] = track.payload
+                reuse[track.id] = track
+
+        self._update({**data, 'tracks': [{**item, 'track': known.get(int(item['id']))} for item in items]})
+        if reuse:
+            self._prepare_tracks(reuse)
 
     async def edit_name(self, title: str) -> None:
         await self._state.http.edit_playlist_name(self.id, self.kind, title)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, Union
+
+from .track import ShortTrack, Track
+
+if TYPE_CHECKING:
+    from .client import Client
+
+_log = logging.getLogger(__name__)
+
+
+class PrefetchedTrack:
+    def __init__(self, track: Track, link: str, head: bytes = b'') -> None:
+        self.track = track
+        self.link = link
+        self.head = head
+
+    def __repr__(self) -> str:
+        return f"<PrefetchedTrack track={self.track!r} head={len(self.head)}>"
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        client: Client,
+        *,
+        lookahead: int = 3,
+        max_concurrency: int = 2,
+        bitrateInKbps: int = 192,
+        codec: str = 'mp3',
+        warm_bytes: int = 0
+    ) -> None:
+        self.client = client
+        self.lookahead = lookahead
+        self.bitrate = bitrateInKbps
+        self.codec = codec
+        self.warm_bytes = warm_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def update(self, queue: Iterable[Union[Track, ShortTrack]]) -> None:
+        upcoming: Dict[int, Union[Track, ShortTrack]] = {}
+        for track in queue:
+            if len(upcoming) >= self.lookahead:
+                break
+            upcoming.setdefault(track.id, track)
+
+        for track_id in list(self._tasks):
+            if track_id not in upcoming:
+                self._tasks.pop(track_id).cancel()
+
+        for track_id, track in upcoming.items():
+            if track_id not in self._tasks:
+                task = asyncio.create_task(self._prefetch(track))
+                task.add_done_callback(self._retrieve_exception)
+                self._tasks[track_id] = task
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task) -> None:
+        # tracks dropped from the queue are never awaited, their failures are only logged
+        if not task.cancelled() and task.exception() is not None:
+            _log.debug("prefetching failed", exc_info=task.exception())
+
+    async def get(self, track: Union[Track, ShortTrack]) -> PrefetchedTrack:
+        task = self._tasks.pop(track.id, None)
+        if task is None or task.cancelled():
+            return await self._resolve(track)
+        return await task
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        self.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _prefetch(self, track: Union[Track, ShortTrack]) -> PrefetchedTrack:
+        async with self._semaphore:
+            return await self._resolve(track)
+
+    async def _resolve(self, track: Union[Track, ShortTrack]) -> PrefetchedTrack:
+        if isinstance(track, ShortTrack):
+            track = await track._to_track()
+
+        link = await track.download_link(self.bitrate, self.codec)
+        head = await self._warm(link) if self.warm_bytes > 0 else b''
+        return PrefetchedTrack(track, link, head)
+
+    async def _warm(self, link: str) -> bytes:
+        head = bytearray()
+        headers = {"Range": f"bytes=0-{self.warm_bytes - 1}"}
+        stream = self.client._state.http.stream_audio(link, self.warm_bytes, headers)
+        async with contextlib.aclosing(stream):
+            async for chunk in stream:
+                head += chunk
+                if len(head) >= self.warm_bytes:
+                    break
+        return bytes(head[:self.warm_bytes])
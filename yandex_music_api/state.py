@@ -1,9 +1,16 @@
 from __future__ import annotations
 import asyncio
-from typing import TYPE_CHECKING, Optional, TypedDict
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypedDict
 
 import aiohttp
 
+from .batch import LikeQueue
+from .cache import DEFAULT_CACHE_OPTIONS, CacheOptions, CacheStats, LRUCache
+from .storage import SQLiteCache
+from .util import SingleFlight, T
+
 
 class DelistTypes(TypedDict):
     track: Track
@@ -28,21 +35,43 @@ else:
 class ConnectionState:
     def __init__(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         httpclient: HTTPClient,
-        loop: asyncio.AbstractEventLoop,
+        loop: Optional[asyncio.AbstractEventLoop],
         token: Optional[str],
-        client: Client
+        client: Client,
+        cache_options: Optional[Dict[str, CacheOptions]] = None,
+        persistent_cache: Optional[SQLiteCache] = None,
+        like_delay: Optional[float] = None
     ) -> None:
         self.http = httpclient
+        self.offloader = httpclient.offloader
+        self.hooks = httpclient.hooks
         self.session = session
         self.loop = loop
         self.token = token
         self.client = client
         self.de_list = de_list
 
-        self._tracks = {}
-        self._users = {}
+        options = {**DEFAULT_CACHE_OPTIONS, **(cache_options or {})}
+        self._caches: Dict[str, LRUCache] = {
+            object_type: LRUCache(*opt) for object_type, opt in options.items()
+        }
+        self._tracks: LRUCache[Track] = self._caches['track']
+        self._albums: LRUCache[Album] = self._caches['album']
+        self._artists: LRUCache[Artist] = self._caches['artist']
+        self._playlists: LRUCache[Playlist] = self._caches['playlist']
+        self._users: LRUCache[User] = self._caches['user']
+        self._download_links: LRUCache[str] = self._caches['download_link']
+        self._download_link_flight = SingleFlight()
+        # one shared object per album/artist id for as long as anything references it
+        self._identity: Dict[str, weakref.WeakValueDictionary] = {
+            'album': weakref.WeakValueDictionary(),
+            'artist': weakref.WeakValueDictionary()
+        }
+        self.persistent_cache = persistent_cache
+        self.like_delay = like_delay
+        self._like_queues: Dict[int, LikeQueue] = {}
         self.userid = None
 
     def _identify(self, account_info: dict) -> dict:
@@ -52,15 +81,100 @@ class ConnectionState:
             pass
         return account_info
 
-    def store_user(self, user: User) -> None:
-        self._users[user.id] = user
+    @staticmethod
+    def object_key(object_type: str, obj: Any) -> Hashable:
+        if object_type == 'playlist':
+            return f'{obj.id}:{obj.kind}'
+        return obj.id
+
+    def store(self, object_type: str, obj: Any) -> Any:
+        return self._caches[object_type].set(self.object_key(object_type, obj), obj)
+
+    def get_cached(self, object_type: str, key: Hashable) -> Optional[Any]:
+        return self._caches[object_type].get(key)
+
+    def intern_model(self, object_type: str, data: Dict[str, Any], refresh: bool = False) -> Any:
+        identity = self._identity[object_type]
+        key = int(data['id'])
+        obj = identity.get(key)
+        if obj is None:
+            obj = self.de_list[object_type](self, data)
+            identity[key] = obj
+        elif refresh:
+            # a payload fetched on its own is fuller than the copy nested in a track
+            obj.__init__(self, data)
+        return obj
+
+    def build_model(self, object_type: str, data: Dict[str, Any]) -> Any:
+        if object_type in self._identity:
+            return self.intern_model(object_type, data, refresh=True)
+        return self.de_list[object_type](self, data)
+
+    async def build_models(self, object_type: str, func: Callable[[Any], T], items: List[Any]) -> List[T]:
+        if not self.hooks:
+            return await self.offloader.build(func, items)
+        started = time.perf_counter()
+        models = await self.offloader.build(func, items)
+        self.hooks.emit('on_parse', object_type, len(models), time.perf_counter() - started)
+        return models
+
+    async def load_payloads(self, object_type: str, keys: Iterable[Hashable]) -> Dict[str, Any]:
+        if self.persistent_cache is None:
+            return {}
+        return await asyncio.to_thread(
+            self.persistent_cache.get_many, object_type, [str(key) for key in keys])
+
+    async def save_payloads(self, object_type: str, payloads: Dict[Hashable, Any]) -> None:
+        if self.persistent_cache is None or not payloads:
+            return
+        await asyncio.to_thread(
+            self.persistent_cache.put_many, object_type,
+            {str(key): payload for key, payload in payloads.items()})
+
+    def like_queue(self) -> Optional[LikeQueue]:
+        if self.like_delay is None:
+            return None
+        queue = self._like_queues.get(self.userid)
+        if queue is None:
+            queue = LikeQueue(self.http, self.userid, delay=self.like_delay)
+            self._like_queues[self.userid] = queue
+        return queue
+
+    async def flush_like_queues(self) -> None:
+        await asyncio.gather(*(queue.close() for queue in self._like_queues.values()))
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {object_type: cache.stats() for object_type, cache in self._caches.items()}
+
+    def store_user(self, user: User) -> User:
+        return self._users.set(user.id, user)
 
     def get_user(self, user_id: int) -> Optional[User]:
         return self._users.get(user_id)
 
     def store_track(self, track: Track) -> Track:
-        self._tracks[track.id] = track
-        return track
+        return self._tracks.set(track.id, track)
 
     def get_track(self, id: int) -> Optional[Track]:
         return self._tracks.get(id)
+
+    def store_album(self, album: Album) -> Album:
+        return self._albums.set(album.id, album)
+
+    def get_album(self, id: int) -> Optional[Album]:
+        return self._albums.get(id)
+
+    def store_artist(self, artist: Artist) -> Artist:
+        return self._artists.set(artist.id, artist)
+
+    def get_artist(self, id: int) -> Optional[Artist]:
+        return self._artists.get(id)
+
+    def store_playlist(self, playlist: Playlist) -> Playlist:
+        return self.store('playlist', playlist)
+
+    def store_download_link(self, key: Tuple[int, int, str], link: str, lifetime: float) -> str:
+        return self._download_links.set(key, link, lifetime)
+
+    def get_download_link(self, key: Tuple[int, int, str]) -> Optional[str]:
+        return self._download_links.get(key)
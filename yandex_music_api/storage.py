@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from . import util
+
+DEFAULT_STORAGE_TTL: Dict[str, float] = {
+    'track': 24 * 3600,
+    'album': 24 * 3600,
+    'artist': 24 * 3600,
+    'playlist': 300
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (type, key)
+) WITHOUT ROWID
+"""
+
+
+class SQLiteCache:
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl: Optional[Dict[str, float]] = None,
+        timeout: float = 30.0
+    ) -> None:
+        self.path = path
+        self.ttl = {**DEFAULT_STORAGE_TTL, **(ttl or {})}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._connection:
+            # WAL lets readers in other processes go on while one process writes
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(_SCHEMA)
+
+    def get_many(self, object_type: str, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        found = {}
+        now = time.time()
+        with self._lock:
+            # stay well below SQLITE_MAX_VARIABLE_NUMBER
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                rows = self._connection.execute(
+                    f"SELECT key, payload FROM payloads WHERE type = ? AND expires_at > ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (object_type, now, *chunk)
+                )
+                for key, payload in rows:
+                    found[key] = util.from_json(payload)
+        return found
+
+    def put_many(self, object_type: str, payloads: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        if not payloads:
+            return
+
+        expires_at = time.time() + (self.ttl.get(object_type, 3600) if ttl is None else ttl)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO payloads (type, key, payload, expires_at) VALUES (?, ?, ?, ?)",
+                [(object_type, key, util.to_json(payload), expires_at)
+                 for key, payload in payloads.items()]
+            )
+
+    def get(self, object_type: str, key: str) -> Optional[Any]:
+        return self.get_many(object_type, [key]).get(key)
+
+    def put(self, object_type: str, key: str, payload: Any, ttl: Optional[float] = None) -> None:
+        self.put_many(object_type, {key: payload}, ttl)
+
+    def delete(self, object_type: str, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM payloads WHERE type = ? AND key = ?", (object_type, key))
+
+    def purge_expired(self) -> int:
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM payloads WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
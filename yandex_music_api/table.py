@@ -0,0 +1,174 @@
+from __future__ import annotations
+import math
+from array import array
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from .types import LibraryPlaylistPayload, PlaylistPayload
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .track import ShortTrack, Track
+
+
+class TrackRow(NamedTuple):
+    id: int
+    album_id: int
+    duration_ms: int
+    timestamp: float
+    artist_id: int
+
+
+def _parse_timestamp(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return math.nan
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def _first_id(items: Optional[List[dict]]) -> int:
+    if not items:
+        return -1
+    return int(items[0]['id'])
+
+
+class TrackTable:
+    # unknown values are stored as -1 for integers and nan for timestamps
+    FIELDS: Dict[str, str] = {
+        'id': 'q',
+        'album_id': 'q',
+        'duration_ms': 'q',
+        'timestamp': 'd',
+        'artist_id': 'q'
+    }
+
+    def __init__(self, columns: Optional[Dict[str, array]] = None) -> None:
+        self._columns: Dict[str, array] = columns or {
+            name: array(typecode) for name, typecode in self.FIELDS.items()
+        }
+
+    @classmethod
+    def from_library(cls, payload: LibraryPlaylistPayload) -> TrackTable:
+        table = cls()
+        for item in payload['library']['tracks']:
+            table.append(int(item['id']), int(item.get('albumId') or -1),
+                         timestamp=_parse_timestamp(item.get('timestamp')))
+        return table
+
+    @classmethod
+    def from_playlist(cls, payload: PlaylistPayload) -> TrackTable:
+        table = cls()
+        for item in payload.get('tracks') or []:
+            track = item.get('track') or {}
+            album_id = _first_id(track.get('albums'))
+            if album_id == -1 and item.get('albumId'):
+                album_id = int(item['albumId'])
+            table.append(
+                int(item.get('id') or track['id']),
+                album_id,
+                track.get('durationMs', -1),
+                _parse_timestamp(item.get('timestamp')),
+                _first_id(track.get('artists'))
+            )
+        return table
+
+    @classmethod
+    def from_tracks(cls, tracks: Iterable[Union[Track, ShortTrack]]) -> TrackTable:
+        table = cls()
+        for track in tracks:
+            added_at = getattr(track, 'added_at', None)
+            data = getattr(track, 'payload', None) or {}
+            table.append(
+                int(track.id),
+                int(getattr(track, 'album_id', None) or _first_id(data.get('albums'))),
+                data.get('durationMs', -1),
+                added_at.timestamp() if added_at is not None else math.nan,
+                _first_id(data.get('artists'))
+            )
+        return table
+
+    def append(
+        self,
+        track_id: int,
+        album_id: int = -1,
+        duration_ms: int = -1,
+        timestamp: float = math.nan,
+        artist_id: int = -1
+    ) -> None:
+        columns = self._columns
+        columns['id'].append(track_id)
+        columns['album_id'].append(album_id)
+        columns['duration_ms'].append(duration_ms)
+        columns['timestamp'].append(timestamp)
+        columns['artist_id'].append(artist_id)
+
+    def __len__(self) -> int:
+        return len(self._columns['id'])
+
+    def __getitem__(self, index: int) -> TrackRow:
+        return TrackRow(*(self._columns[name][index] for name in self.FIELDS))
+
+    def __iter__(self):
+        return map(TrackRow, *(self._columns[name] for name in self.FIELDS))
+
+    def __repr__(self) -> str:
+        return f"<TrackTable rows={len(self)}>"
+
+    def column(self, name: str) -> Union[array, 'numpy.ndarray']:
+        # a copy, a view would keep the array from growing on append()
+        column = self._columns[name]
+        if numpy is None:
+            return array(column.typecode, column)
+        return self._view(name).copy()
+
+    def _view(self, name: str) -> 'numpy.ndarray':
+        # zero-copy, must not outlive the operation that asked for it
+        column = self._columns[name]
+        if not len(column):
+            return numpy.array([], dtype=column.typecode)
+        return numpy.frombuffer(column, dtype=column.typecode)
+
+    def take(self, indices: Sequence[int]) -> TrackTable:
+        if numpy is not None:
+            indices = numpy.asarray(indices, dtype=numpy.intp)
+            return TrackTable({
+                name: array(column.typecode, self._view(name)[indices].tobytes())
+                for name, column in self._columns.items()
+            })
+        return TrackTable({
+            name: array(column.typecode, (column[i] for i in indices))
+            for name, column in self._columns.items()
+        })
+
+    def filter(self, mask: Sequence[bool]) -> TrackTable:
+        if numpy is not None:
+            return self.take(numpy.flatnonzero(numpy.asarray(mask, dtype=bool)))
+        return self.take([i for i, keep in enumerate(mask) if keep])
+
+    def sort(self, by: str = 'timestamp', reverse: bool = False) -> TrackTable:
+        if numpy is not None:
+            values = self._view(by)
+            # ties keep their original order either way, as with sorted()
+            return self.take(numpy.argsort(-values if reverse else values, kind='stable'))
+        column = self._columns[by]
+        return self.take(sorted(range(len(column)), key=column.__getitem__, reverse=reverse))
+
+    def dedupe(self, by: str = 'id') -> TrackTable:
+        # the first occurrence of every value is kept, in the original order
+        if numpy is not None:
+            indices = numpy.unique(self._view(by), return_index=True)[1]
+            return self.take(numpy.sort(indices))
+        seen = set()
+        indices = []
+        for i, value in enumerate(self._columns[by]):
+            if value not in seen:
+                seen.add(value)
+                indices.append(i)
+        return self.take(indices)
+
+    async def materialize(self, client: Client, chunk_size: int = 100, max_concurrency: int = 4) -> List[Track]:
+        return await client.hydrate_tracks(self._columns['id'], chunk_size, max_concurrency)
@@ -1,10 +1,16 @@
 from __future__ import annotations
+import asyncio
+import inspect
+import os
+import time
 from datetime import datetime
 
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, List, Optional, Tuple, Union
 from hashlib import md5
 import xmltodict
 
+from yandex_music_api.exceptions import BitrateNotFound
+from yandex_music_api.download import DEFAULT_SEGMENT_SIZE, RangedDownload
 from yandex_music_api.types import TrackMajorPayload, TrackPayload, TrackShortPayload
 
 if TYPE_CHECKING:
@@ -14,6 +20,12 @@ if TYPE_CHECKING:
 
 
 SIGN_SALT = 'XGRlBW9FXlekgbPrRHuSiA'
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# signed links are only accepted for a short while after the `ts` they were issued at
+DOWNLOAD_LINK_TTL = 60.0
+DOWNLOAD_LINK_FORMAT = 'https://{host}/get-mp3/{sign}/{ts}{path}'
+# fields of a track's album entry that describe the track, not the shared album
+ALBUM_TRACK_FIELDS = ('trackPosition',)
 
 
 def get_track_sign(data: dict) -> str:
@@ -23,23 +35,46 @@ def get_track_sign(data: dict) -> str:
     return sign
 
 
-def decode_download_info(xmldata: str) -> str:
+def get_download_link_lifetime(ts: str) -> float:
+    # ts is the issue time in hex-encoded microseconds
+    try:
+        issued_at = int(ts, 16) / 1_000_000
+    except ValueError:
+        return DOWNLOAD_LINK_TTL
+
+    lifetime = issued_at + DOWNLOAD_LINK_TTL - time.time()
+    if lifetime > DOWNLOAD_LINK_TTL:
+        # clocks are out of sync, trust only our own
+        return DOWNLOAD_LINK_TTL
+    return max(lifetime, 0.0)
+
+
+def decode_download_info_with_lifetime(xmldata: str) -> Tuple[str, float]:
     data = xmltodict.parse(xmldata)['download-info']
     host = data['host']
     ts = data['ts']
     path = data['path']
     sign = get_track_sign(data)
 
-    return f'https://{host}/get-mp3/{sign}/{ts}{path}'
+    link = DOWNLOAD_LINK_FORMAT.format(host=host, sign=sign, ts=ts, path=path)
+    return link, get_download_link_lifetime(ts)
+
+
+def decode_download_info(xmldata: str) -> str:
+    return decode_download_info_with_lifetime(xmldata)[0]
 
 
 class Track:
+    __slots__ = (
+        '_state', '_data', '_albums', '_artists', 'available', 'cover_uri', 'diration',
+        'file_size', 'lyrics_available', 'major', 'image', 'id', 'title', '__weakref__'
+    )
+
     def __init__(self, state: ConnectionState, data: TrackPayload) -> None:
         self._state = state
-        self.albums: List[Album] = [state.de_list['album'](state, album)
-                                    for album in data['albums']]
-        self.artists: List[Artist] = [
-            state.de_list['artist'](state, artist) for artist in data['artists']]
+        self._data = data
+        self._albums: Optional[List[Album]] = None
+        self._artists: Optional[List[Artist]] = None
         self.available: bool = data['available']
         self.cover_uri = data.get('coverUri')
         self.diration: float = data['durationMs']/1000
@@ -49,8 +84,42 @@ class Track:
         self.image: str = data.get('ogImage')
         self.id: int = int(data['id'])
         self.title: str = data['title']
-        self.major: dict = data['major']
-        self.artist_names: List[str] = [art.name for art in self.artists]
+
+    # nested models are built on first access, most of them are never touched
+    @property
+    def albums(self) -> List[Album]:
+        if self._albums is None:
+            albums = self._data['albums']
+            self._albums = [self._state.intern_model('album', album) for album in albums]
+            # the shared Album objects keep the payload, only the per-track fields stay here
+            self._data = {**self._data, 'albums': [
+                {field: album[field] for field in ALBUM_TRACK_FIELDS if field in album} for album in albums]}
+        return self._albums
+
+    @property
+    def artists(self) -> List[Artist]:
+        if self._artists is None:
+            self._artists = [self._state.intern_model('artist', artist)
+                             for artist in self._data['artists']]
+            self._data = {k: v for k, v in self._data.items() if k != 'artists'}
+        return self._artists
+
+    @property
+    def payload(self) -> TrackPayload:
+        data = self._data
+        if self._albums is not None:
+            data = {**data, 'albums': [
+                {**{k: v for k, v in album._data.items() if k not in ALBUM_TRACK_FIELDS}, **fields}
+                for album, fields in zip(self._albums, data['albums'])]}
+        if self._artists is not None:
+            data = {**data, 'artists': [artist._data for artist in self._artists]}
+        return data
+
+    @property
+    def artist_names(self) -> List[str]:
+        if self._artists is None:
+            return [artist['name'] for artist in self._data['artists']]
+        return [art.name for art in self._artists]
 
     @property
     def album(self) -> Optional[Album]:
@@ -72,32 +141,100 @@ class Track:
 
     async def download_link(
         self,
-        bitrateInKbps: int = 192
+        bitrateInKbps: int = 192,
+        codec: str = 'mp3'
     ) -> str:
+        key = (self.id, bitrateInKbps, codec)
+        link = self._state.get_download_link(key)
+        if link is not None:
+            return link
+
+        # a burst of plays of the same track resolves the link only once
+        return await self._state._download_link_flight.do(
+            key, lambda: Track._resolve_download_link(self, key))
+
+    async def _resolve_download_link(self, key: Tuple[int, int, str]) -> str:
+        _, bitrateInKbps, codec = key
         results = await self._state.http.get_download_info(self.id)
         for res in results:
-            if res['bitrateInKbps'] == bitrateInKbps:
+            if res['bitrateInKbps'] == bitrateInKbps and res['codec'] == codec:
                 url = res['downloadInfoUrl']
                 break
         else:
-            raise Exception('bitrateInKbps error')
+            raise BitrateNotFound(bitrateInKbps)
         data = await self._state.http.get_from_downloadinfo(url)
-        link = decode_download_info(data)
+        link, lifetime = decode_download_info_with_lifetime(data)
+        if lifetime > 0:
+            self._state.store_download_link(key, link, lifetime)
         return link
 
+    async def stream(
+        self,
+        bitrateInKbps: int = 192,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        link = await self.download_link(bitrateInKbps)
+        async for chunk in self._state.http.stream_audio(link, chunk_size):
+            yield chunk
+
+    async def download(
+        self,
+        fp: Union[str, os.PathLike, BinaryIO, bytearray, asyncio.StreamWriter],
+        bitrateInKbps: int = 192,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        parallel: int = 1,
+        segment_size: int = DEFAULT_SEGMENT_SIZE
+    ) -> int:
+        if isinstance(fp, (str, os.PathLike)):
+            with open(fp, 'wb') as file:
+                return await self.download(file, bitrateInKbps, chunk_size, parallel, segment_size)
+
+        if parallel > 1:
+            if not isinstance(fp, bytearray) and not hasattr(fp, 'seek'):
+                raise TypeError('Parallel downloads require a seekable file or a bytearray')
+            link = await self.download_link(bitrateInKbps)
+            ranged = RangedDownload(
+                self._state.http,
+                link,
+                segment_size=segment_size,
+                max_concurrency=parallel,
+                chunk_size=chunk_size
+            )
+            return await ranged.into(fp)
+
+        drain = getattr(fp, 'drain', None)
+        written = 0
+        async for chunk in self.stream(bitrateInKbps, chunk_size):
+            result = fp.extend(chunk) if isinstance(fp, bytearray) else fp.write(chunk)
+            if inspect.isawaitable(result):
+                await result
+            if drain is not None:
+                # wait for the pipe to be read before pulling more data
+                await drain()
+            written += len(chunk)
+        return written
+
     async def like(self) -> None:
+        queue = self._state.like_queue()
+        if queue is not None:
+            return await queue.like(self.id)
         userid = self._state.userid
         await self._state.http.like_track(userid, [self.id])
 
     async def dislike(self) -> None:
+        queue = self._state.like_queue()
+        if queue is not None:
+            return await queue.dislike(self.id)
         userid = self._state.userid
         await self._state.http.dislike_track(userid, [self.id])
 
 
 class ShortTrack:
+    __slots__ = ('_state', 'id', 'album_id', 'added_at', '__weakref__')
+
     def __init__(self, state: ConnectionState, data: TrackShortPayload) -> None:
         self._state = state
-        self.id: int = data['id']
+        self.id: int = int(data['id'])
         self.album_id: int = data['albumId']
         self.added_at: datetime = datetime.fromisoformat(data['timestamp'])
 
@@ -111,5 +248,7 @@ class ShortTrack:
         return await self._state.client.get_track(self.id, with_only_result=True)
 
     download_link = Track.download_link
+    stream = Track.stream
+    download = Track.download
     like = Track.like
     dislike = Track.dislike
@@ -0,0 +1,381 @@
+import asyncio
+import base64
+import contextlib
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+from typing import Any, AsyncContextManager, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from . import util
+
+CassetteKey = Tuple[str, str, Tuple[Tuple[str, str], ...], Optional[str], Optional[str]]
+
+
+class ConnectorOptions(NamedTuple):
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    ttl_dns_cache: Optional[int] = 10
+    # total and per read timeouts in seconds, None disables them
+    timeout: Optional[float] = 300.0
+    read_timeout: Optional[float] = None
+
+
+# api.music.yandex.net is one host, so its keep-alive connections are worth holding on to
+DEFAULT_API_CONNECTOR = ConnectorOptions(limit=100, limit_per_host=64, keepalive_timeout=60.0, ttl_dns_cache=300)
+# audio is spread over many storage hosts, and a long stream must not hit a total timeout
+DEFAULT_AUDIO_CONNECTOR = ConnectorOptions(limit=32, limit_per_host=8, keepalive_timeout=15.0, ttl_dns_cache=60,
+                                           timeout=None, read_timeout=30.0)
+
+
+def body_digest(data: Any) -> Optional[str]:
+    if data is None:
+        return None
+    if isinstance(data, dict):
+        data = urlencode(sorted(data.items()), doseq=True)
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def cassette_key(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    digest: Optional[str] = None
+) -> CassetteKey:
+    # ranged audio requests are told apart by their Range header, POSTs by their body
+    byte_range = (headers or {}).get("Range")
+    return method.upper(), url, tuple(sorted((params or {}).items())), byte_range, digest
+
+
+class RecordedContent:
+    def __init__(self, body: bytes = b"", path: Optional[str] = None) -> None:
+        self._body = body
+        self._path = path
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        if self._path is None:
+            for i in range(0, len(self._body), n):
+                yield self._body[i:i+n]
+            return
+
+        with open(self._path, "rb") as file:
+            while chunk := file.read(n):
+                yield chunk
+
+    async def read(self) -> bytes:
+        if self._path is None:
+            return self._body
+        with open(self._path, "rb") as file:
+            return file.read()
+
+
+class RecordedResponse:
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes = b"",
+        path: Optional[str] = None
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.content = RecordedContent(body, path)
+        self._size = os.path.getsize(path) if path is not None else len(body)
+
+    @property
+    def content_length(self) -> Optional[int]:
+        length = self.headers.get("Content-Length")
+        return int(length) if length is not None else self._size
+
+    async def read(self) -> bytes:
+        return await self.content.read()
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return (await self.read()).decode(encoding)
+
+    def __repr__(self) -> str:
+        return f"<RecordedResponse {self.method} {self.url} status={self.status}>"
+
+
+class Transport:
+    """Sends requests over two connection pools, one for the api and one for the audio hosts.
+
+    Sessions that are not passed in are created on first use, inside the running loop,
+    and are closed by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        audio_session: Optional[aiohttp.ClientSession] = None,
+        connector: ConnectorOptions = DEFAULT_API_CONNECTOR,
+        audio_connector: ConnectorOptions = DEFAULT_AUDIO_CONNECTOR
+    ) -> None:
+        self.session = session
+        self.audio_session = audio_session
+        self.connector = connector
+        self.audio_connector = audio_connector
+        self._owned: List[aiohttp.ClientSession] = []
+
+    @staticmethod
+    def create_session(options: ConnectorOptions) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=options.limit,
+            limit_per_host=options.limit_per_host,
+            keepalive_timeout=options.keepalive_timeout,
+            ttl_dns_cache=options.ttl_dns_cache
+        )
+        timeout = aiohttp.ClientTimeout(total=options.timeout, sock_read=options.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def get_session(self, audio: bool = False) -> aiohttp.ClientSession:
+        if audio:
+            if self.audio_session is None:
+                self.audio_session = self.create_session(self.audio_connector)
+                self._owned.append(self.audio_session)
+            return self.audio_session
+
+        if self.session is None:
+            self.session = self.create_session(self.connector)
+            self._owned.append(self.session)
+        return self.session
+
+    def request(self, method: str, url: str, *, audio: bool = False, **kwargs: Any) -> AsyncContextManager[Any]:
+        return self.get_session(audio).request(method, url, **kwargs)
+
+    async def close(self) -> None:
+        owned, self._owned = self._owned, []
+        for session in owned:
+            await session.close()
+        # sessions passed in by the caller are theirs to close
+        if self.session in owned:
+            self.session = None
+        if self.audio_session in owned:
+            self.audio_session = None
+
+
+class BlobWriter:
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._file = tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False)
+        self._hash = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hash.update(chunk)
+
+    def finish(self) -> str:
+        self._file.close()
+        digest = self._hash.hexdigest()
+        os.replace(self._file.name, os.path.join(self.directory, digest))
+        return digest
+
+
+class Cassette:
+    """Request/response pairs stored as gzipped JSON lines.
+
+    Audio bodies are kept once per sha256 digest in a directory next to the cassette.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.blobs = path + ".blobs"
+        self._file: Optional[gzip.GzipFile] = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            self._file = gzip.open(self.path, "ab")
+        self._file.write(util.to_json(record).encode() + b"\n")
+
+    def blob_writer(self) -> BlobWriter:
+        return BlobWriter(self.blobs)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs, digest)
+
+    def load(self) -> Dict[CassetteKey, List[Dict[str, Any]]]:
+        records: Dict[CassetteKey, List[Dict[str, Any]]] = {}
+        with gzip.open(self.path, "rb") as file:
+            for line in file:
+                record = util.from_json(line)
+                headers = {"Range": record["range"]} if record.get("range") else None
+                key = cassette_key(record["method"], record["url"], record["params"], headers,
+                                   record.get("body_digest"))
+                records.setdefault(key, []).append(record)
+        return records
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(body).decode(), "encoding": "base64"}
+
+
+def _decode_body(record: Dict[str, Any]) -> bytes:
+    if record.get("encoding") == "base64":
+        return base64.b64decode(record["body"])
+    return record["body"].encode("utf-8")
+
+
+class _RecordingContent:
+    def __init__(self, content: Any, writer: BlobWriter) -> None:
+        self._content = content
+        self._writer = writer
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        async for chunk in self._content.iter_chunked(n):
+            self._writer.write(chunk)
+            yield chunk
+
+    async def read(self) -> bytes:
+        body = await self._content.read()
+        self._writer.write(body)
+        return body
+
+
+class _RecordingResponse:
+    """Passes an audio response through while its body is written to the blob store."""
+
+    def __init__(self, response: aiohttp.ClientResponse, writer: BlobWriter) -> None:
+        self._response = response
+        self.status = response.status
+        self.headers = response.headers
+        self.content = _RecordingContent(response.content, writer)
+
+    @property
+    def content_length(self) -> Optional[int]:
+        return self._response.content_length
+
+    async def read(self) -> bytes:
+        return await self.content.read()
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return (await self.read()).decode(encoding)
+
+
+class RecordingTransport(Transport):
+    def __init__(self, path: str, session: Optional[aiohttp.ClientSession] = None, **options: Any) -> None:
+        super().__init__(session, **options)
+        self.cassette = Cassette(path)
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        status: int,
+        headers: Dict[str, str],
+        started: float,
+        body: Dict[str, str]
+    ) -> None:
+        params = kwargs.get("params") or {}
+        self.cassette.write({
+            "method": method.upper(),
+            "url": url,
+            "params": {k: str(v) for k, v in params.items()},
+            "range": (kwargs.get("headers") or {}).get("Range"),
+            "body_digest": body_digest(kwargs.get("data")),
+            "status": status,
+            "headers": headers,
+            "elapsed": time.perf_counter() - started,
+            **body
+        })
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        audio: bool = False,
+        **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        started = time.perf_counter()
+        async with self.get_session(audio).request(method, url, **kwargs) as response:
+            headers = dict(response.headers)
+            if audio:
+                # audio is streamed to disk as the caller reads it, never held in memory;
+                # a caller that stops early records only the part it read
+                writer = self.cassette.blob_writer()
+                try:
+                    yield _RecordingResponse(response, writer)
+                finally:
+                    self._record(method, url, kwargs, response.status, headers, started,
+                                 {"body_ref": writer.finish()})
+                return
+            body = await response.read()
+
+        self._record(method, url, kwargs, response.status, headers, started, _encode_body(body))
+        yield RecordedResponse(method, url, response.status, headers, body)
+
+    async def close(self) -> None:
+        self.cassette.close()
+        await super().close()
+
+
+class ReplayTransport(Transport):
+    def __init__(
+        self,
+        path: str,
+        *,
+        latency: float = 0.0,
+        time_scale: float = 1.0
+    ) -> None:
+        super().__init__()
+        self.latency = latency
+        # 0 replays instantly, 0.1 replays recorded delays ten times faster
+        self.time_scale = time_scale
+        self.cassette = Cassette(path)
+        self._records = self.cassette.load()
+        self._positions: Dict[CassetteKey, int] = {}
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        audio: bool = False,
+        **kwargs: Any
+    ) -> AsyncIterator[RecordedResponse]:
+        params = {k: str(v) for k, v in (kwargs.get("params") or {}).items()}
+        key = cassette_key(method, url, params, kwargs.get("headers"), body_digest(kwargs.get("data")))
+        records = self._records.get(key)
+        if not records:
+            raise LookupError(f"No recorded response for {method} {url}")
+
+        # repeated requests replay the recorded responses in order, then keep the last one
+        position = self._positions.get(key, 0)
+        record = records[min(position, len(records) - 1)]
+        self._positions[key] = position + 1
+
+        delay = self.latency + record.get("elapsed", 0.0) * self.time_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if "body_ref" in record:
+            path = self.cassette.blob_path(record["body_ref"])
+            yield RecordedResponse(record["method"], record["url"], record["status"], record["headers"], path=path)
+        else:
+            yield RecordedResponse(record["method"], record["url"], record["status"], record["headers"],
+                                   _decode_body(record))
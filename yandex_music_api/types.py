@@ -221,7 +221,8 @@ class SimilarTracksPayload(TypedDict):
 
 class ArtistWithTrackPayload(TypedDict):
     artist: ArtistPayload
-    tracks: List[List[str]]
+    pager: PagerPayload
+    tracks: List['TrackPayload']
 
 
 class TrackCoverPayload(TypedDict):
@@ -6,6 +6,8 @@ if TYPE_CHECKING:
 
 
 class User:
+    __slots__ = ('_state', 'data', 'id', 'login', 'name', 'sex', 'verified', '__weakref__')
+
     def __init__(self, state: ConnectionState, data: dict) -> None:
         self._state = state
         self.data = data
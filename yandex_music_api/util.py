@@ -1,6 +1,7 @@
 
+import asyncio
 from enum import StrEnum
-from typing import Any, List, Optional, Self, Union
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Self, TypeVar, Union
 
 from yandex_music_api.album import Album
 from yandex_music_api.artist import Artist
@@ -26,6 +27,8 @@ else:
     def from_json(data: Union[str, bytes, bytearray, memoryview]):
         return orjson.loads(data)
 
+T = TypeVar('T')
+
 de_list = {
     'artist': Artist,
     'album': Album,
@@ -34,6 +37,51 @@ de_list = {
 }
 
 
+def parse_ids(ids: Union[List[Union[str, int]], int, str]) -> List[str]:
+    if isinstance(ids, (list, set, tuple)):
+        return [str(object_id) for object_id in ids]
+    return [object_id for object_id in str(ids).split(',') if object_id]
+
+
+class SingleFlight:
+    """Shares the result of one in-flight call between all callers with the same key."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # the leading call was cancelled, try again on our own
+            return await self.do(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
 class OperationType(StrEnum):
     INSERT = 'insert'
     DELETE = 'delete'